@@ -0,0 +1,158 @@
+"""
+Compare interpreter throughput before and after pre-decoded, table-driven
+dispatch, and with superinstructions.
+
+Usage: python -m benchmarks.dispatch [file.lalg.txt ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+from compilador.codegen.superinstructions import fuse
+from compilador.interpreter.object_interpreter import Interpreter
+from compilador.lexicon.object_lexicon import ObjectLexicon
+
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(__file__), 'programs')
+
+
+class StringInterpreter:
+    """
+    The original string-decoding interpreter, kept as the "before" reference.
+
+    Relational operators use the corrected operand order so both engines run
+    the same loops.
+    """
+
+    def __init__(self, code):
+        self.code = code
+        self.data_stack = []
+        self.i = 0
+        self.steps = 0
+
+    def run(self):
+        while self.i < len(self.code):
+            op, arg = self.code[self.i].split(' ', maxsplit=2)
+            fn = getattr(self, f'_op_{op.lower()}')
+            if arg:
+                fn(arg)
+            else:
+                fn()
+            self.i += 1
+            self.steps += 1
+
+    def __basic_op(self, op):
+        d2 = self.data_stack.pop()
+        d1 = self.data_stack[-1]
+        self.data_stack[-1] = op(d1, d2)
+
+    def _op_crvl(self, n):
+        self.data_stack.append(self.data_stack[int(n)])
+
+    def _op_crct(self, k):
+        self.data_stack.append(float(k))
+
+    def _op_soma(self):
+        d = self.data_stack.pop()
+        self.data_stack[-1] += d
+
+    def _op_subt(self):
+        d = self.data_stack.pop()
+        self.data_stack[-1] -= d
+
+    def _op_mult(self):
+        d = self.data_stack.pop()
+        self.data_stack[-1] *= d
+
+    def _op_divi(self):
+        d = self.data_stack.pop()
+        self.data_stack[-1] /= d
+
+    def _op_inve(self):
+        self.data_stack[-1] *= -1
+
+    def _op_cpme(self):
+        self.__basic_op(lambda d1, d2: 1 if d1 < d2 else 0)
+
+    def _op_cpma(self):
+        self.__basic_op(lambda d1, d2: 1 if d1 > d2 else 0)
+
+    def _op_cpig(self):
+        self.__basic_op(lambda d1, d2: 1 if d1 == d2 else 0)
+
+    def _op_cdes(self):
+        self.__basic_op(lambda d1, d2: 1 if d1 != d2 else 0)
+
+    def _op_cpmi(self):
+        self.__basic_op(lambda d1, d2: 1 if d1 <= d2 else 0)
+
+    def _op_cmai(self):
+        self.__basic_op(lambda d1, d2: 1 if d1 >= d2 else 0)
+
+    def _op_armz(self, n):
+        self.data_stack[int(n)] = self.data_stack.pop()
+
+    def _op_dsvi(self, p):
+        self.i = int(p) - 1
+
+    def _op_dsvf(self, p):
+        if self.data_stack.pop() == 0:
+            self.i = int(p) - 1
+
+    def _op_impr(self):
+        print(self.data_stack.pop())
+
+    def _op_alme(self, n):
+        for _ in range(int(n)):
+            self.data_stack.append(0)
+
+    def _op_inpp(self):
+        pass
+
+    def _op_para(self):
+        pass
+
+
+def timed(engine):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        engine.run()
+    return time.perf_counter() - start, out.getvalue()
+
+
+def bench(filepath):
+    code = ObjectLexicon(filepath).parse()
+
+    before = StringInterpreter(code)
+    t_before, out_before = timed(before)
+    t_after, out_after = timed(Interpreter(code))
+    t_fused, out_fused = timed(Interpreter(fuse(code)))
+
+    if not out_before == out_after == out_fused:
+        raise AssertionError(f'{filepath}: outputs differ')
+
+    steps = before.steps
+    name = os.path.basename(filepath)
+    print(f'{name:<24} {steps:>10} instr'
+          f' | before {steps / t_before:>12,.0f} instr/s'
+          f' | after {steps / t_after:>12,.0f} instr/s'
+          f' | x{t_before / t_after:.2f}'
+          f' | fused {steps / t_fused:>12,.0f} instr/s'
+          f' | x{t_before / t_fused:.2f}')
+
+
+def main(argv):
+    files = argv or sorted(
+        os.path.join(PROGRAMS_DIR, f)
+        for f in os.listdir(PROGRAMS_DIR)
+        if f.endswith('.lalg.txt'))
+
+    for filepath in files:
+        bench(filepath)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,157 @@
+"""
+How the front end scales with the shape of the program.
+
+Usage: python -m benchmarks.frontend_scaling [--vary PARAM] [--values N ...]
+                                             [--statements N] [--declarations N] [--depth N]
+                                             [--nesting N] [--comments P] [--repeat N]
+
+Programs from benchmarks.lalg_generator are compiled for each value of the
+varied parameter (statements by default), with the others fixed. Each
+phase is timed on its own, best of --repeat runs, and run once more under
+tracemalloc for its peak memory:
+
+    tokenize    Tokenizer over the whole source, tokens discarded
+    parse       AstLexicon over the tokens of the previous phase, building
+                the tree and the SymbolsTable
+    codegen     StackWalker emitting ObjectCode from the tree
+    compile     ObjectLexicon, the three phases together, for reference
+
+`exp` is the growth exponent of the compile time against the source size
+since the previous row: about 1 while the front end stays linear, 2 for
+quadratic behaviour.
+"""
+import argparse
+import math
+import time
+import tracemalloc
+
+from benchmarks.lalg_generator import ProgramGenerator
+from compilador.codegen.walkers import StackWalker
+from compilador.lexicon.ast_lexicon import AstLexicon
+from compilador.lexicon.object_lexicon import ObjectLexicon
+from compilador.tape import TextTape
+from compilador.tokenizer import Tokenizer
+
+
+PHASES = ('tokenize', 'parse', 'codegen', 'compile')
+
+DEFAULT_VALUES = {
+    'statements': [1_000, 10_000, 100_000],
+    'declarations': [10, 100, 1_000, 10_000],
+    'depth': [0, 4, 16, 64],
+    'nesting': [0, 4, 16, 64],
+    'comments': [0.0, 0.5, 1.0],
+}
+
+
+def scan(text) -> list:
+    tokens = []
+    tokenizer = Tokenizer(TextTape(text))
+    try:
+        while True:
+            tokens.append(tokenizer.next_token())
+    except EOFError:
+        return tokens
+
+
+def tokenize(text):
+    next_token = Tokenizer(TextTape(text)).next_token
+    try:
+        while True:
+            next_token()
+    except EOFError:
+        pass
+
+
+class Replay:
+    """Tokenizer handing out tokens scanned beforehand, so parsing is timed alone."""
+
+    def __init__(self, tokens):
+        self._next = iter(tokens).__next__
+
+    def __call__(self, tape):
+        return self
+
+    def next_token(self):
+        try:
+            return self._next()
+        except StopIteration:
+            raise EOFError() from None
+
+
+def parse(text, tokens):
+    return AstLexicon(TextTape(text), tokenizer=Replay(tokens)).parse()
+
+
+def measure(fn, repeat):
+    """Best time of `repeat` runs, and the peak of traced memory of one more run."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def bench(shape: dict, repeat: int) -> dict:
+    text = ProgramGenerator(**shape).text()
+    tokens = scan(text)
+    program = parse(text, tokens)
+
+    row = {'chars': len(text), 'tokens': len(tokens)}
+    row['tokenize'] = measure(lambda: tokenize(text), repeat)
+    row['parse'] = measure(lambda: parse(text, tokens), repeat)
+    # walking replaces Symbol.data, so the same tree can be walked again
+    row['codegen'] = measure(lambda: StackWalker().generate(program), repeat)
+    row['compile'] = measure(lambda: ObjectLexicon(TextTape(text)).parse(), repeat)
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.frontend_scaling')
+    parser.add_argument('--vary', choices=sorted(DEFAULT_VALUES), default='statements')
+    parser.add_argument('--values', nargs='+', type=float, default=None)
+    parser.add_argument('--statements', type=int, default=10_000)
+    parser.add_argument('--declarations', type=int, default=16)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--nesting', type=int, default=1)
+    parser.add_argument('--comments', type=float, default=0.1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    shape = {name: getattr(args, name) for name in DEFAULT_VALUES}
+    values = args.values or DEFAULT_VALUES[args.vary]
+    convert = float if args.vary == 'comments' else int
+
+    fixed = ', '.join(f'{name}={value}' for name, value in shape.items() if name != args.vary)
+    print(f'varying {args.vary} ({fixed}), best of {args.repeat}')
+    print(f'{args.vary:>12} {"chars":>10} {"tokens":>9} | '
+          + ' | '.join(f'{phase:>8} ms {"KiB":>8}' for phase in PHASES)
+          + f' | {"ns/char":>7} {"exp":>5}')
+
+    previous = None
+    for value in values:
+        shape[args.vary] = convert(value)
+        row = bench(shape, args.repeat)
+
+        chars = row['chars']
+        elapsed = row['compile'][0]
+        exponent = ''
+        if previous is not None and chars != previous[0]:
+            exponent = f'{math.log(elapsed / previous[1]) / math.log(chars / previous[0]):.2f}'
+        previous = chars, elapsed
+
+        print(f'{shape[args.vary]:>12} {chars:>10} {row["tokens"]:>9} | '
+              + ' | '.join(f'{row[phase][0] * 1000:>11.1f} {row[phase][1] / 1024:>8.0f}' for phase in PHASES)
+              + f' | {elapsed / chars * 1e9:>7.0f} {exponent:>5}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Latency of a one-character edit with IncrementalCompiler, against
+compiling the whole file again with ObjectLexicon.
+
+Usage: python -m benchmarks.incremental_edit [statements ...]
+
+Each edit changes a digit in a statement in the middle of the program,
+with the program from benchmarks.stress_statements. The incremental code
+is checked against a full compile after the edits.
+"""
+import io
+import statistics
+import sys
+import time
+
+from benchmarks.stress_statements import write_program
+from compilador.incremental import IncrementalCompiler
+from compilador.lexicon.object_lexicon import ObjectLexicon
+from compilador.tape import TextTape
+
+
+def make_program(statements):
+    text = io.StringIO()
+    write_program(text, statements)
+    return text.getvalue()
+
+
+def bench(statements, edits=200):
+    text = make_program(statements)
+
+    start = time.perf_counter()
+    expected = ObjectLexicon(TextTape(text)).parse()
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiler = IncrementalCompiler(text)
+    initial = time.perf_counter() - start
+    if compiler.code != expected:
+        raise AssertionError('initial code differs')
+
+    # the '1' of a '1.0' near the middle
+    offset = text.index('1.0', len(text) // 2)
+    times = []
+    for i in range(edits):
+        digit = '2' if i % 2 == 0 else '1'
+        start = time.perf_counter()
+        compiler.edit(offset, 1, digit)
+        times.append(time.perf_counter() - start)
+
+    text = compiler.text
+    if compiler.code != ObjectLexicon(TextTape(text)).parse():
+        raise AssertionError('code differs after the edits')
+
+    print(f'{statements:>9} statements | full compile {full * 1000:>9.1f} ms | '
+          f'incremental setup {initial * 1000:>9.1f} ms | '
+          f'edit median {statistics.median(times) * 1e6:>7.1f} us, '
+          f'max {max(times) * 1e6:>7.1f} us | {compiler.reparsed} chars re-parsed')
+
+
+def main(argv):
+    sizes = [int(n) for n in argv] or [1_000, 10_000, 100_000]
+    for statements in sizes:
+        bench(statements)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,168 @@
+"""
+Generator of synthetic, valid LALG programs.
+
+Usage: python -m benchmarks.lalg_generator [statements [declarations [depth [nesting [comments]]]]]
+
+Writes the program to stdout. The shape of the program is set by:
+
+    statements      statements in the program, nested ones included
+    declarations    declared variables, half integer and half real
+    depth           parentheses nesting of the assigned expressions
+    nesting         if/while nesting depth of the compound statements
+    comments        probability of a comment before each statement
+
+Programs are type correct, so every parser and backend accepts them, but
+loops are not guaranteed to end: they are meant to be compiled, not run.
+Parsing is recursive in the expression depth, keep it well under a
+hundred. The output only depends on the arguments and `seed`.
+"""
+import random
+import sys
+
+from compilador.token import INTEIRO, REAL
+
+
+WORDS = (
+    'soma', 'valor', 'contador', 'limite', 'passo', 'media', 'total',
+    'parcial', 'resultado', 'entrada', 'saida', 'laco', 'teste', 'ajuste',
+)
+
+RELATIONS = ('=', '<>', '>=', '<=', '>', '<')
+
+# simple statements between compound ones
+COMPOUND_EVERY = 4
+
+INDENT = '    '
+
+
+class ProgramGenerator:
+    def __init__(self, statements=1000, declarations=16, depth=2, nesting=1, comments=0.1, seed=0):
+        if declarations < 2:
+            raise ValueError('São necessárias ao menos 2 declarações, uma inteira e uma real')
+
+        self.statements = statements
+        self.depth = depth
+        self.nesting = nesting
+        self.comments = comments
+        self.random = random.Random(seed)
+
+        integers = declarations // 2
+        self.names = {
+            INTEIRO: [f'i{n}' for n in range(integers)],
+            REAL: [f'r{n}' for n in range(declarations - integers)],
+        }
+        self._emitted = 0
+
+    def lines(self):
+        """Yield the program line by line."""
+        yield 'program sintetico'
+        groups = []
+        for keyword, tipo in (('integer', INTEIRO), ('real', REAL)):
+            names = self.names[tipo]
+            for i in range(0, len(names), 10):
+                groups.append(f'{keyword}: {", ".join(names[i:i + 10])}')
+        yield ';\n'.join(groups)
+        yield 'begin'
+
+        self._emitted = 0
+        pending = None
+        while self._emitted < max(1, self.statements):
+            if pending is not None:
+                pending[-1] += ';'
+                yield from pending
+
+            compound = self.nesting > 0 and self._emitted % (COMPOUND_EVERY + 1) == COMPOUND_EVERY
+            pending = self._statement(self.nesting if compound else 0, 1)
+        yield from pending
+
+        yield 'end.'
+
+    def write(self, f):
+        for line in self.lines():
+            f.write(line)
+            f.write('\n')
+
+    def text(self) -> str:
+        return ''.join(line + '\n' for line in self.lines())
+
+    def _comment(self, indent: str):
+        words = ' '.join(self.random.choice(WORDS) for _ in range(self.random.randint(2, 12)))
+        if self.random.random() < 0.5:
+            return f'{indent}{{ {words} }}'
+        return f'{indent}/* {words}\n{indent}   {words} */'
+
+    def _statement(self, level: int, indent: int) -> [str]:
+        prefix = INDENT * indent
+        lines = []
+        if self.comments and self.random.random() < self.comments:
+            lines.append(self._comment(prefix))
+
+        self._emitted += 1
+        if level == 0:
+            lines.append(prefix + self._simple())
+            return lines
+
+        # a compound statement holds a simple one and the next level
+        cond = self._condition()
+        is_if = self.random.random() < 0.5
+        lines.append(f'{prefix}if {cond} then' if is_if else f'{prefix}while {cond} do')
+        lines += self._statement(0, indent + 1)
+        lines[-1] += ';'
+        lines += self._statement(level - 1, indent + 1)
+        if is_if and self.random.random() < 0.5:
+            lines.append(f'{prefix}else')
+            lines += self._statement(0, indent + 1)
+        lines.append(f'{prefix}$')
+        return lines
+
+    def _simple(self) -> str:
+        tipo = self.random.choice((INTEIRO, REAL))
+        kind = self.random.random()
+        if kind < 0.15:
+            return f'read({self._var(tipo)})'
+        elif kind < 0.3:
+            return f'write({self._var(tipo)})'
+        return f'{self._var(tipo)} := {self._expression(tipo, self.depth)}'
+
+    def _condition(self) -> str:
+        tipo = self.random.choice((INTEIRO, REAL))
+        return f'{self._var(tipo)} {self.random.choice(RELATIONS)} {self._const(tipo)}'
+
+    def _var(self, tipo) -> str:
+        return self.random.choice(self.names[tipo])
+
+    def _const(self, tipo) -> str:
+        if tipo == INTEIRO:
+            return str(self.random.randint(1, 999))
+        return f'{self.random.randint(0, 999)}.{self.random.randint(1, 99)}'
+
+    def _atom(self, tipo) -> str:
+        if self.random.random() < 0.5:
+            return self._var(tipo)
+        return self._const(tipo)
+
+    def _expression(self, tipo, depth: int) -> str:
+        # built inside out, so generating deep expressions does not recurse
+        expr = self._atom(tipo)
+        if self.random.random() < 0.2:
+            expr = '-' + expr
+        for _ in range(depth):
+            op = self.random.choice('+-*/')
+            # only divide by constants, which are never zero
+            right = self._const(tipo) if op == '/' else self._atom(tipo)
+            expr = f'({expr}) {op} {right}'
+        return expr
+
+
+def generate(*args, **kwargs) -> str:
+    """Text of a program, see ProgramGenerator for the arguments."""
+    return ProgramGenerator(*args, **kwargs).text()
+
+
+def main(argv):
+    types = (int, int, int, int, float)
+    ProgramGenerator(*(t(a) for t, a in zip(types, argv))).write(sys.stdout)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
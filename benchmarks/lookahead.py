@@ -0,0 +1,60 @@
+"""
+Count tokenizer invocations made by the parsers.
+
+For each program, prints the tokenizer calls per source character made by
+tokenizing the source once and by each parser. Equal numbers mean the
+parser never scans a token twice.
+
+Usage: python -m benchmarks.lookahead [file.lalg.txt ...]
+"""
+import os
+import sys
+
+from compilador.codegen import IntermediateCode
+from compilador.lexicon.lexicon import Lexicon
+from compilador.lexicon.object_lexicon import ObjectLexicon
+from compilador.tape import Tape
+from compilador.tokenizer import Tokenizer
+
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(__file__), 'programs')
+
+
+def tokenize(filepath):
+    tokenizer = Tokenizer(Tape(filepath))
+    try:
+        while True:
+            tokenizer.next_token()
+    except EOFError:
+        pass
+    return tokenizer.calls
+
+
+def bench(filepath):
+    size = len(Tape(filepath).code)
+    counts = {'tokenize': tokenize(filepath)}
+
+    parser = ObjectLexicon(filepath)
+    parser.parse()
+    counts['ObjectLexicon'] = parser.tokenizer.calls
+
+    parser = Lexicon(filepath, IntermediateCode())
+    parser.parse()
+    counts['Lexicon'] = parser.tokenizer.calls
+
+    calls = ' | '.join(f'{name} {n:>6} ({n / size:.3f}/char)' for name, n in counts.items())
+    print(f'{os.path.basename(filepath):<24} {size:>7} chars | {calls}')
+
+
+def main(argv):
+    files = argv or sorted(
+        os.path.join(PROGRAMS_DIR, f)
+        for f in os.listdir(PROGRAMS_DIR)
+        if f.endswith('.lalg.txt'))
+
+    for filepath in files:
+        bench(filepath)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
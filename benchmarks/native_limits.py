@@ -0,0 +1,71 @@
+"""
+Check that NativeInterpreter runs programs past the limits of the python
+compiler, with the same output as Interpreter.
+
+Usage: python -m benchmarks.native_limits [loops [terms [ifs]]]
+
+    loops   statically nested while loops (python allows 20)
+    terms   operands of a single `a + a + ...` expression
+    ifs     nested if statements (python allows 100 indentation levels)
+"""
+import sys
+import time
+
+from compilador.codegen.PythonCode import PythonCode
+from compilador.interpreter.channels import BufferedInput, ListOutput
+from compilador.interpreter.native import NativeInterpreter
+from compilador.interpreter.object_interpreter import Interpreter
+from compilador.lexicon.object_lexicon import ObjectLexicon
+from compilador.tape import TextTape
+
+
+def nested_loops(depth):
+    names = [f'x{i}' for i in range(depth)]
+    lines = [f'program lacos\nreal: s, {", ".join(names)}\nbegin\ns := 0.0;']
+    for name in names:
+        lines.append(f'{name} := 2.0; while {name} > 1.0 do {name} := {name} - 1.0; s := s + 1.0;')
+    lines.append('s := s * 2.0' + ' $' * depth + ';\nwrite(s)\nend.')
+    return '\n'.join(lines)
+
+
+def long_chain(terms):
+    chain = ' + '.join(['a'] * terms)
+    return (f'program cadeia\nreal: a, b\nbegin\na := 1.0; b := 0.0;\na := {chain};\n'
+            f'while {chain} < {terms * terms + 3}.0 do a := a + 1.0; b := -{chain} $;\n'
+            'write(a); write(b)\nend.')
+
+
+def nested_ifs(depth):
+    return ('program ses\nreal: a\nbegin\nread(a);\n'
+            + 'if a > 0.0 then a := a - 1.0; ' * depth
+            + 'write(a)' + ' else write(a) $' * depth
+            + '\nend.')
+
+
+def check(name, text, inputs=()):
+    out = ListOutput()
+    Interpreter(ObjectLexicon(TextTape(text)).parse(),
+                input_channel=BufferedInput(inputs), output_channel=out).run()
+
+    start = time.perf_counter()
+    compiler = PythonCode()
+    ObjectLexicon(TextTape(text), compiler).parse()
+    native = ListOutput()
+    NativeInterpreter(compiler, input_channel=BufferedInput(inputs), output_channel=native).run()
+    elapsed = time.perf_counter() - start
+
+    if native.values != out.values:
+        raise AssertionError(f'{name}: native wrote {native.values}, expected {out.values}')
+    print(f'{name:<24} {len(compiler.code):>7} lines {elapsed * 1000:>9.1f} ms  ok')
+
+
+def main(argv):
+    loops, terms, ifs = (int(a) for a in argv + ['25', '5000', '120'][len(argv):])
+    check(f'{loops} nested loops', nested_loops(loops))
+    check(f'{terms} term chain', long_chain(terms))
+    check(f'{ifs} nested ifs', nested_ifs(ifs), [ifs // 2])
+    check(f'{ifs} nested ifs, all', nested_ifs(ifs), [ifs * 2])
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,70 @@
+"""
+Compare the quadruple (register) VM against the stack VM on the same programs.
+
+Programs must pass Lexicon's type checks, so constants need the same type
+as the variables they are used with (e.g. `a - 1.0` for a real `a`).
+
+Usage: python -m benchmarks.register_vs_stack [file.lalg.txt ...]
+"""
+import os
+import sys
+import time
+
+from compilador.codegen import IntermediateCode
+from compilador.interpreter.channels import ListOutput
+from compilador.interpreter.object_interpreter import Interpreter
+from compilador.interpreter.quadruple_interpreter import QuadrupleInterpreter
+from compilador.lexicon.lexicon import Lexicon
+from compilador.lexicon.object_lexicon import ObjectLexicon
+
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(__file__), 'programs')
+
+
+def timed(engine_cls, code, repeat):
+    best = None
+    values = None
+    for _ in range(repeat):
+        out = ListOutput()
+        engine = engine_cls(code, output_channel=out)
+        start = time.perf_counter()
+        engine.run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        values = out.values
+    return best, values
+
+
+def bench(filepath, repeat=3):
+    engines = {
+        'register': (QuadrupleInterpreter, Lexicon(filepath, IntermediateCode()).parse()),
+        'stack': (Interpreter, ObjectLexicon(filepath).parse()),
+        'stack -O': (Interpreter, ObjectLexicon(filepath, optimize=True, fuse=True).parse()),
+    }
+
+    results = dict()
+    outputs = []
+    for name, (engine_cls, code) in engines.items():
+        results[name], values = timed(engine_cls, code, repeat)
+        outputs.append(values)
+
+    if any(values != outputs[0] for values in outputs):
+        raise AssertionError(f'{filepath}: outputs differ')
+
+    fastest = min(results, key=results.get)
+    timings = ' | '.join(f'{name} {t * 1000:>9.1f} ms' for name, t in results.items())
+    print(f'{os.path.basename(filepath):<24} {timings} | fastest: {fastest}')
+
+
+def main(argv):
+    files = argv or sorted(
+        os.path.join(PROGRAMS_DIR, f)
+        for f in os.listdir(PROGRAMS_DIR)
+        if f.endswith('.lalg.txt'))
+
+    for filepath in files:
+        bench(filepath)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
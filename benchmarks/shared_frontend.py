@@ -0,0 +1,59 @@
+"""
+Compare producing the stack and quadruple listings of a program with
+ObjectLexicon and Lexicon, which parse it once each, against a single
+AstLexicon parse walked by both backends.
+
+Usage: python -m benchmarks.shared_frontend [file.lalg.txt ...]
+
+Also checks that both ways produce the same code.
+"""
+import os
+import sys
+import time
+
+from compilador.codegen import IntermediateCode
+from compilador.codegen.walkers import QuadrupleWalker, StackWalker
+from compilador.lexicon.ast_lexicon import AstLexicon
+from compilador.lexicon.lexicon import Lexicon
+from compilador.lexicon.object_lexicon import ObjectLexicon
+
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(__file__), 'programs')
+
+
+def two_passes(filepath):
+    return ObjectLexicon(filepath).parse(), Lexicon(filepath, IntermediateCode()).parse()
+
+
+def shared(filepath):
+    program = AstLexicon(filepath).parse()
+    return StackWalker().generate(program), QuadrupleWalker().generate(program)
+
+
+def best_of(fn, filepath, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(filepath)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv):
+    files = argv or sorted(
+        os.path.join(PROGRAMS_DIR, f)
+        for f in os.listdir(PROGRAMS_DIR)
+        if f.endswith('.lalg.txt'))
+
+    for filepath in files:
+        t_two, expected = best_of(two_passes, filepath, 5)
+        t_shared, result = best_of(shared, filepath, 5)
+        if result != expected:
+            raise AssertionError(f'{filepath}: code differs')
+
+        print(f'{os.path.basename(filepath):<24} two passes {t_two * 1000:>9.2f} ms | '
+              f'shared {t_shared * 1000:>9.2f} ms | {t_two / t_shared:.2f}x')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
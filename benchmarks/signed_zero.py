@@ -0,0 +1,75 @@
+"""
+Check that folding keeps the sign of zero: every engine must write the same
+values as the quadruple engine, which runs the arithmetic unfolded.
+
+Usage: python -m benchmarks.signed_zero
+
+Values are compared by repr, as -0.0 == 0.0.
+"""
+from compilador.codegen import IntermediateCode
+from compilador.codegen.PythonCode import PythonCode
+from compilador.interpreter.channels import BufferedInput, ListOutput
+from compilador.interpreter.native import NativeInterpreter
+from compilador.interpreter.object_interpreter import Interpreter
+from compilador.interpreter.program import Program
+from compilador.interpreter.quadruple_interpreter import QuadrupleInterpreter, QuadrupleProgram
+from compilador.lexicon.lexicon import Lexicon
+from compilador.lexicon.object_lexicon import ObjectLexicon
+from compilador.tape import TextTape
+
+
+EXPRESSIONS = (
+    'x / 2.0 + 0.0',
+    '0.0 + x / 2.0',
+    'x / 2.0 - (-0.0)',
+    'x / 2.0 + (-0.0)',
+    'x / 2.0 - 0.0',
+    '(-((x / 2.0))) * 3.0 + 0.0',
+    'x / 2.0 * 1.0',
+    '1.0 * (x / 2.0)',
+    'x / 2.0 / 1.0',
+)
+
+INPUTS = ('-0', '0', '3')
+
+
+def program(expr: str) -> str:
+    return f'program zero\nreal: x, y\nbegin\nread(x);\ny := {expr};\nwrite(y)\nend.'
+
+
+def _native(text):
+    compiler = PythonCode()
+    ObjectLexicon(TextTape(text), compiler).parse()
+    return compiler
+
+
+ENGINES = {
+    'stack': lambda text: (Interpreter, Program.assemble(ObjectLexicon(TextTape(text)).parse())),
+    'stack-fused': lambda text: (Interpreter, Program.assemble(
+        ObjectLexicon(TextTape(text), optimize=True, fuse=True).parse())),
+    'native': lambda text: (NativeInterpreter, _native(text)),
+}
+
+
+def run(engine_cls, code, value) -> [str]:
+    out = ListOutput()
+    engine_cls(code, input_channel=BufferedInput([value]), output_channel=out).run()
+    return [repr(v) for v in out.values]
+
+
+def main():
+    for expr in EXPRESSIONS:
+        text = program(expr)
+        quadruple = QuadrupleProgram.assemble(Lexicon(TextTape(text), IntermediateCode()).parse())
+        prepared = {name: prepare(text) for name, prepare in ENGINES.items()}
+        for value in INPUTS:
+            expected = run(QuadrupleInterpreter, quadruple, value)
+            for name, (engine_cls, code) in prepared.items():
+                values = run(engine_cls, code, value)
+                if values != expected:
+                    raise AssertionError(f'{expr} with x = {value}: {name} wrote {values}, expected {expected}')
+        print(f'{expr:<30} ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Compile a program with a very long statement list.
+
+The list productions are parsed by loops, so this must work with Python's
+default recursion limit, which is checked to be untouched.
+
+Usage: python -m benchmarks.stress_statements [statements]
+
+Defaults to 1,000,000 statements in a single block.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from compilador.codegen import IntermediateCode
+from compilador.codegen.walkers import StackWalker
+from compilador.lexicon.lexicon import Lexicon
+from compilador.lexicon.object_lexicon import ObjectLexicon
+from compilador.lexicon.table_lexicon import TableLexicon
+from compilador.regex_tokenizer import RegexTokenizer
+
+
+STATEMENTS = (
+    'a := a + 1.0',
+    'b := a * 2.0 - b',
+    'if a > b then a := a - 1.0 else b := b + 1.0 $',
+    'write(a)',
+)
+
+
+def write_program(f, statements):
+    f.write('program stress\nreal: a, b\nbegin\n')
+    for i in range(statements - 1):
+        f.write(STATEMENTS[i % len(STATEMENTS)])
+        f.write(';\n')
+    f.write('write(b)\nend.\n')
+
+
+def compile_with(name, parse):
+    start = time.perf_counter()
+    code = parse()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<14} {elapsed:>7.2f} s  {len(code):>9} instructions')
+
+
+def main(argv):
+    statements = int(argv[0]) if argv else 1_000_000
+    limit = sys.getrecursionlimit()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, 'stress.lalg.txt')
+        with open(filepath, 'wt') as f:
+            write_program(f, statements)
+        print(f'{statements} statements, {os.path.getsize(filepath)} chars, recursion limit {limit}')
+
+        compile_with('ObjectLexicon', lambda: ObjectLexicon(filepath, tokenizer=RegexTokenizer).parse())
+        compile_with('TableLexicon', lambda: StackWalker().generate(TableLexicon(filepath, tokenizer=RegexTokenizer).parse()))
+        compile_with('Lexicon', lambda: Lexicon(filepath, IntermediateCode(), tokenizer=RegexTokenizer).parse())
+
+    if sys.getrecursionlimit() != limit:
+        raise AssertionError('recursion limit was changed')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,70 @@
+"""
+Compare the state machine Tokenizer against RegexTokenizer.
+
+Usage: python -m benchmarks.tokenizer [file.lalg.txt ...]
+
+Without arguments, sources of increasing size are generated by repeating a
+block with identifiers, numbers, multi-char symbols and both comment styles.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from compilador.regex_tokenizer import RegexTokenizer
+from compilador.tape import Tape
+from compilador.tokenizer import Tokenizer
+
+
+BLOCK = '''
+    { comentario entre chaves }
+    soma1 := soma1 + 12 * (valor2 - 3.25);
+    /* comentario
+       em bloco */
+    if soma1 <= 100.5 then x := x - 1 else x := 0 $;
+    while contador <> 0 do contador := contador - 1 $;
+'''
+
+
+def tokenize(tokenizer_cls, filepath):
+    tokenizer = tokenizer_cls(Tape(filepath))
+    count = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            tokenizer.next_token()
+            count += 1
+    except EOFError:
+        pass
+    return time.perf_counter() - start, count
+
+
+def bench(filepath):
+    size = os.path.getsize(filepath)
+    t_state, n_state = tokenize(Tokenizer, filepath)
+    t_regex, n_regex = tokenize(RegexTokenizer, filepath)
+    if n_state != n_regex:
+        raise AssertionError(f'{filepath}: token counts differ ({n_state} != {n_regex})')
+
+    print(f'{size:>10} chars {n_state:>9} tokens'
+          f' | automato {size / t_state / 1e6:>6.2f} Mchar/s'
+          f' | regex {size / t_regex / 1e6:>6.2f} Mchar/s'
+          f' | x{t_state / t_regex:.1f}')
+
+
+def main(argv):
+    if argv:
+        for filepath in argv:
+            bench(filepath)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for repeat in (100, 1000, 10000):
+            filepath = os.path.join(tmp, f'source{repeat}.lalg.txt')
+            with open(filepath, 'wt') as f:
+                f.write(BLOCK * repeat)
+            bench(filepath)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,219 @@
+"""
+Throughput of the execution engines on compute-heavy LALG workloads.
+
+Usage: python -m benchmarks.vm_workloads [workload.lalg.txt ...] [--engines NAME ...]
+                                         [--warmup N] [--repeat N] [--output FILE]
+
+Each workload in benchmarks/workloads reads its input from the file next to
+it with the same name and the .in extension. Every engine runs every
+workload `--warmup` times untimed and `--repeat` times timed, and must
+write the same values as the stack interpreter.
+
+The results are written as JSON to stdout, or to --output, and a summary
+table to stderr. Rates use the best run. `instructions` counts what the
+engine itself executes, instructions or quadruples, and is null for
+engines without instructions (native). `stack_instructions` is the count
+of the unoptimized stack code for the same run, the common unit of work to
+compare engines with.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from compilador import __version__
+from compilador.codegen import IntermediateCode
+from compilador.interpreter import dispatch, quadruple_interpreter
+from compilador.interpreter.channels import BufferedInput, ListOutput
+from compilador.interpreter.native import compile_file, NativeInterpreter
+from compilador.interpreter.object_interpreter import Interpreter
+from compilador.interpreter.program import Program
+from compilador.interpreter.quadruple_interpreter import QuadrupleInterpreter, QuadrupleProgram
+from compilador.lexicon.lexicon import Lexicon
+from compilador.lexicon.object_lexicon import ObjectLexicon
+
+
+WORKLOADS_DIR = os.path.join(os.path.dirname(__file__), 'workloads')
+
+
+def count_stack(program: Program, read) -> int:
+    """Instructions executed by Interpreter for `program`, with its dispatch loop."""
+    ops = program.ops
+    args = dispatch.resolve_args(program)
+    table = dispatch.build_table([], read, ListOutput().write)
+
+    i = 0
+    end = len(ops)
+    count = 0
+    while i < end:
+        i = table[ops[i]](args[i], i)
+        count += 1
+    return count
+
+
+def count_quadruple(program: QuadrupleProgram, read) -> int:
+    """Quadruples executed by QuadrupleInterpreter for `program`, with its dispatch loop."""
+    code = program.instructions
+    table = quadruple_interpreter.build_table(program.make_frame(), read, ListOutput().write)
+
+    i = 0
+    end = len(code)
+    count = 0
+    while i < end:
+        op, a, b, r = code[i]
+        i = table[op](a, b, r, i)
+        count += 1
+    return count
+
+
+class Engine:
+    """
+    How to prepare a workload for an execution engine and run it.
+
+    `prepare(filepath)` compiles the source into what `engine_cls` takes as
+    its code, so compiling and assembling are not timed. `count(prepared,
+    read)` returns the instructions executed, or is None.
+    """
+
+    def __init__(self, prepare, engine_cls, count=None):
+        self.prepare = prepare
+        self.engine_cls = engine_cls
+        self.count = count
+
+
+ENGINES = {
+    'stack': Engine(lambda filepath: Program.assemble(ObjectLexicon(filepath).parse()),
+                    Interpreter, count_stack),
+    'stack-fused': Engine(lambda filepath: Program.assemble(ObjectLexicon(filepath, optimize=True, fuse=True).parse()),
+                          Interpreter, count_stack),
+    'quadruple': Engine(lambda filepath: QuadrupleProgram.assemble(Lexicon(filepath, IntermediateCode()).parse()),
+                        QuadrupleInterpreter, count_quadruple),
+    'native': Engine(compile_file, NativeInterpreter),
+}
+
+
+def input_path(filepath: str) -> str:
+    base = filepath[:-len('.lalg.txt')] if filepath.endswith('.lalg.txt') else os.path.splitext(filepath)[0]
+    return base + '.in'
+
+
+def run_once(engine: Engine, prepared, inputs: [float]):
+    out = ListOutput()
+    instance = engine.engine_cls(prepared, input_channel=BufferedInput(inputs), output_channel=out)
+    start = time.perf_counter()
+    instance.run()
+    return time.perf_counter() - start, out.values
+
+
+def bench(filepath: str, engines: [str], warmup: int, repeat: int) -> [dict]:
+    with open(input_path(filepath), 'rt') as f:
+        inputs = BufferedInput(f).values
+
+    reference = ENGINES['stack']
+    stack_program = reference.prepare(filepath)
+    stack_instructions = count_stack(stack_program, BufferedInput(inputs).read)
+    _, expected = run_once(reference, stack_program, inputs)
+
+    name = os.path.basename(filepath)
+    results = []
+    for engine_name in engines:
+        engine = ENGINES[engine_name]
+        prepared = engine.prepare(filepath)
+
+        for _ in range(warmup):
+            run_once(engine, prepared, inputs)
+
+        times = []
+        for _ in range(repeat):
+            elapsed, values = run_once(engine, prepared, inputs)
+            if values != expected:
+                raise AssertionError(f'{name}: {engine_name} wrote {values}, expected {expected}')
+            times.append(elapsed)
+
+        best = min(times)
+        instructions = None
+        if engine.count is not None:
+            instructions = engine.count(prepared, BufferedInput(inputs).read)
+
+        results.append({
+            'workload': name,
+            'engine': engine_name,
+            'instructions': instructions,
+            'instructions_per_second': None if instructions is None else instructions / best,
+            'stack_instructions': stack_instructions,
+            'stack_instructions_per_second': stack_instructions / best,
+            'wall_time': {
+                'best': best,
+                'median': statistics.median(times),
+                'mean': statistics.mean(times),
+                'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+                'runs': times,
+            },
+        })
+    return results
+
+
+def commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(__file__),
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.vm_workloads')
+    parser.add_argument('workloads', nargs='*')
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help='write the JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    files = args.workloads or sorted(
+        os.path.join(WORKLOADS_DIR, f)
+        for f in os.listdir(WORKLOADS_DIR)
+        if f.endswith('.lalg.txt'))
+
+    results = []
+    for filepath in files:
+        for result in bench(filepath, args.engines, args.warmup, args.repeat):
+            results.append(result)
+            instructions = result['instructions']
+            print(f'{result["workload"]:<26} {result["engine"]:<12}'
+                  f' {result["wall_time"]["best"] * 1000:>9.1f} ms'
+                  f' | {"-" if instructions is None else instructions:>10} instr'
+                  f' | {result["stack_instructions_per_second"]:>13,.0f} stack instr/s',
+                  file=sys.stderr)
+
+    report = {
+        'meta': {
+            'compiler_version': __version__,
+            'commit': commit(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'warmup': args.warmup,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'wt') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+from . import __version__
+from .codegen import IntermediateCode
+from .codegen.PythonCode import PythonCode
+from .lexicon.lexicon import Lexicon
+from .lexicon.object_lexicon import ObjectLexicon
+from .tape import TextTape
+
+
+# bump whenever a backend changes the code it generates or its format, so
+# entries written by a previous compiler are not reused
+CODEGEN_VERSION = 1
+
+
+def _python_source(filepath):
+    compiler = PythonCode()
+    ObjectLexicon(filepath, compiler).parse()
+    return compiler.code
+
+
+# each takes a source path or a Tape
+backends = {
+    'object': lambda filepath: ObjectLexicon(filepath).parse(),
+    'object-optimized': lambda filepath: ObjectLexicon(filepath, optimize=True, fuse=True).parse(),
+    'intermediate': lambda filepath: Lexicon(filepath, IntermediateCode()).parse(),
+    'python': _python_source,
+}
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f'CacheStats<hits={self.hits}, misses={self.misses}, evictions={self.evictions}>'
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CompilationCache:
+    """
+    On-disk cache of generated code, keyed by the sha256 of the compiler
+    and codegen versions, the backend name and the source text.
+
+    Entries are written to a temporary file and renamed into place, so
+    readers in other processes never see partial entries. Writes and
+    evictions are serialized with a lock file where fcntl is available.
+    Reading an entry refreshes its mtime, which is used as the LRU order
+    when the total size goes above `max_size` bytes.
+    """
+
+    suffix = '.json'
+
+    def __init__(self, directory: str, max_size: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_size = max_size
+        self.stats = CacheStats()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(source: bytes, backend: str) -> str:
+        h = hashlib.sha256()
+        h.update(f'{__version__}\0{CODEGEN_VERSION}\0{backend}\0'.encode())
+        h.update(source)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    @contextlib.contextmanager
+    def _lock(self):
+        if fcntl is None:
+            yield
+            return
+
+        with open(os.path.join(self.directory, '.lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, 'rt', encoding='utf-8') as f:
+                code = json.load(f)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            # missing, evicted by another process or corrupted
+            return None
+        return code
+
+    def put(self, key: str, code: [str]):
+        data = json.dumps(code).encode('utf-8')
+        with self._lock():
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(tmp)
+                raise
+            self._evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+                self.stats.evictions += 1
+            total -= size
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        with self._lock():
+            for _, _, path in self._entries():
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+
+    def compile(self, filepath: str, backend: str = 'object') -> [str]:
+        """Return the code generated by `backend` for a source file, compiling it only on a miss."""
+        if backend not in backends:
+            raise ValueError(f'Backend desconhecido: {backend!r}')
+
+        with open(filepath, 'rb') as f:
+            source = f.read()
+        key = self.key(source, backend)
+
+        code = self.get(key)
+        if code is not None:
+            self.stats.hits += 1
+            return code
+
+        self.stats.misses += 1
+        # compile the bytes that were hashed, the file may have changed since.
+        # Decoded like Tape reads files, in text mode
+        text = io.TextIOWrapper(io.BytesIO(source)).read()
+        code = backends[backend](TextTape(text, filepath))
+        self.put(key, code)
+        return code
@@ -0,0 +1,279 @@
+"""
+Command line entry point: python -m compilador <compile|run|check> paths...
+
+Paths can be LALG sources or directories, searched recursively for
+sources. Files are compiled in parallel by a process pool, and a summary
+with the throughput and every failure, with its position, is printed at
+the end. The exit status is 1 if any file failed.
+
+    python -m compilador compile src/ -o build/
+    python -m compilador check src/ -j 8
+    python -m compilador run dados/exemplo.lalg.txt --input valores.txt
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+
+from . import __version__
+from .cache import backends
+from .codegen.PythonCode import load as load_python
+from .errors import CompilerError
+from .interpreter import binary
+from .interpreter.channels import BufferedInput, ConsoleInput
+from .interpreter.native import NativeInterpreter
+from .interpreter.object_interpreter import Interpreter
+from .interpreter.program import Program
+from .interpreter.quadruple_interpreter import QuadrupleInterpreter
+from .lexicon.object_lexicon import ObjectLexicon
+
+
+source_suffixes = ('.lalg.txt', '.lalg')
+
+# artifact extension by backend, object code is written in the binary format
+artifact_suffixes = {
+    'object': '.lalgc',
+    'object-optimized': '.lalgc',
+    'intermediate': '.quad',
+    'python': '.py',
+}
+
+
+# execution engine: (backend, interpreter factory)
+engines = {
+    'object': ('object-optimized', lambda code, filepath, *args: Interpreter(code, *args)),
+    'quadruple': ('intermediate', lambda code, filepath, *args: QuadrupleInterpreter(code, *args)),
+    'native': ('python', lambda code, filepath, *args: NativeInterpreter(load_python(code, filepath), *args)),
+}
+
+
+class Result:
+    """Outcome of compiling one file. `code` is only sent back when asked for."""
+
+    __slots__ = ('filepath', 'artifact', 'code', 'error', 'line', 'column')
+
+    def __init__(self, filepath, artifact=None, code=None, error=None, line=None, column=None):
+        self.filepath = filepath
+        self.artifact = artifact
+        self.code = code
+        self.error = error
+        self.line = line
+        self.column = column
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def describe(self) -> str:
+        where = self.filepath
+        if self.line is not None:
+            where = f'{where}:{self.line}:{self.column}'
+        # continuation lines of the message are indented under the position
+        return f'{where}: ' + self.error.replace('\n', '\n    ')
+
+
+def is_source(filename: str) -> bool:
+    return filename.endswith(source_suffixes)
+
+
+def strip_suffix(filename: str) -> str:
+    for suffix in source_suffixes:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return os.path.splitext(filename)[0]
+
+
+def collect(paths) -> [(str, str)]:
+    """
+    Expand files and directories into (source, relative path) pairs.
+
+    The relative path of a file found in a directory is taken from that
+    directory, so the output directory mirrors its layout. Files named
+    explicitly are taken as sources whatever their extension.
+    """
+    found = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            pairs = []
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if is_source(name):
+                        filepath = os.path.join(root, name)
+                        pairs.append((filepath, os.path.relpath(filepath, path)))
+        else:
+            pairs = [(path, os.path.basename(path))]
+
+        for filepath, relative in pairs:
+            key = os.path.realpath(filepath)
+            if key not in seen:
+                seen.add(key)
+                found.append((filepath, relative))
+    return found
+
+
+def artifact_path(filepath: str, relative: str, backend: str, output_dir: str = None) -> str:
+    """Where the artifact of a source goes: next to it, or mirrored under `output_dir`."""
+    base = filepath if output_dir is None else os.path.join(output_dir, relative)
+    return strip_suffix(base) + artifact_suffixes[backend]
+
+
+def generate(filepath: str, backend: str):
+    """
+    Code of a source for `backend`, and the addresses of its variables.
+
+    Only object code has addresses, for the symbol map of .lalgc files.
+    """
+    if artifact_suffixes[backend] != '.lalgc':
+        return backends[backend](filepath), None
+
+    optimize = backend == 'object-optimized'
+    lexicon = ObjectLexicon(filepath, optimize=optimize, fuse=optimize)
+    return lexicon.parse(), lexicon.compiler.symbols
+
+
+def write_artifact(code: [str], backend: str, path: str, symbols: dict = None):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if artifact_suffixes[backend] == '.lalgc':
+        binary.dump(Program.assemble(code, symbols), path)
+    else:
+        with open(path, 'wt', encoding='utf-8') as f:
+            f.write('\n'.join(code) + '\n')
+
+
+def compile_one(filepath: str, backend: str, artifact: str = None, keep_code=False) -> Result:
+    """
+    Compile a source with `backend`, writing the code to `artifact` if given.
+
+    Runs in the worker processes, so errors are returned instead of raised.
+    """
+    try:
+        code, symbols = generate(filepath, backend)
+        if artifact is not None:
+            write_artifact(code, backend, artifact, symbols)
+    except CompilerError as err:
+        result = Result(filepath, error=f'erro {err.error_type.lower()}: {err.msg.strip()}')
+        if err.location is not None:
+            result.line, result.column = err.location.line, err.location.column
+        return result
+    except EOFError as err:
+        return Result(filepath, error=f'erro léxico: {err}')
+    except (OSError, ValueError) as err:
+        return Result(filepath, error=str(err))
+    except RecursionError:
+        return Result(filepath, error='programa aninhado demais para o compilador')
+    except Exception as err:
+        # one bad file must not stop the batch
+        return Result(filepath, error=f'erro interno: {type(err).__name__}: {err}')
+
+    return Result(filepath, artifact, code if keep_code else None)
+
+
+def compile_all(jobs: [tuple], workers: int = None) -> [Result]:
+    """Run compile_one over argument tuples, in a process pool unless `workers` is 1."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers <= 1:
+        return [compile_one(*args) for args in jobs]
+
+    # large chunks keep the pool overhead low with thousands of small files
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(compile_one, *zip(*jobs), chunksize=chunksize))
+
+
+def summarize(results: [Result], elapsed: float, out=sys.stderr) -> int:
+    """Print the failures and the totals, returning the exit status."""
+    failures = [r for r in results if not r.ok]
+    for result in failures:
+        print(result.describe(), file=out)
+
+    rate = len(results) / elapsed if elapsed > 0 else float('inf')
+    print(f'{len(results)} files, {len(results) - len(failures)} ok, {len(failures)} failed '
+          f'in {elapsed:.2f}s ({rate:.1f} files/s)', file=out)
+    return 1 if failures else 0
+
+
+def _compile(args) -> int:
+    sources = collect(args.paths)
+    if args.command == 'check':
+        jobs = [(filepath, args.backend) for filepath, _ in sources]
+    else:
+        jobs = [(filepath, args.backend, artifact_path(filepath, relative, args.backend, args.output_dir))
+                for filepath, relative in sources]
+
+    start = time.perf_counter()
+    results = compile_all(jobs, args.jobs)
+    return summarize(results, time.perf_counter() - start)
+
+
+def _run(args) -> int:
+    backend, factory = engines[args.engine]
+    sources = collect(args.paths)
+
+    start = time.perf_counter()
+    results = compile_all([(filepath, backend, None, True) for filepath, _ in sources], args.jobs)
+    status = summarize(results, time.perf_counter() - start)
+
+    for result in results:
+        if not result.ok:
+            continue
+        if len(results) > 1:
+            print(f'==> {result.filepath}')
+
+        if args.input is None:
+            channel = ConsoleInput('> ')
+        else:
+            channel = BufferedInput.from_file(args.input)
+        try:
+            factory(result.code, result.filepath, '', channel).run()
+        except Exception as err:
+            # a program failing must not stop the next ones
+            sys.stdout.flush()
+            print(f'{result.filepath}: erro de execução: {str(err) or type(err).__name__}', file=sys.stderr)
+            status = 1
+
+    return status
+
+
+def parser() -> argparse.ArgumentParser:
+    main = argparse.ArgumentParser(prog='python -m compilador', description='Compilador LALG')
+    main.add_argument('--version', action='version', version=__version__)
+    commands = main.add_subparsers(dest='command', required=True)
+
+    def add(name, help_, backend):
+        sub = commands.add_parser(name, help=help_)
+        sub.add_argument('paths', nargs='+', help='source files or directories')
+        sub.add_argument('-j', '--jobs', type=int, default=None,
+                         help='worker processes (default: one per CPU, 1 compiles in this process)')
+        if backend:
+            sub.add_argument('-b', '--backend', choices=sorted(backends), default=backend)
+        return sub
+
+    sub = add('compile', 'compile sources, writing the code next to them', 'object')
+    sub.add_argument('-o', '--output-dir', default=None,
+                     help='write the code here instead, mirroring the directories given')
+    sub.set_defaults(fn=_compile)
+
+    sub = add('check', 'compile sources without writing anything', 'intermediate')
+    sub.set_defaults(fn=_compile)
+
+    sub = add('run', 'compile and run sources, one after the other', None)
+    sub.add_argument('-e', '--engine', choices=sorted(engines), default='object')
+    sub.add_argument('-i', '--input', default=None,
+                     help='file with the values read by the programs (default: ask in the terminal)')
+    sub.set_defaults(fn=_run)
+
+    return main
+
+
+def main(argv=None) -> int:
+    args = parser().parse_args(argv)
+    return args.fn(args)
@@ -1,4 +1,3 @@
-import logging
 from typing import Any
 
 from ._base import CodeGenerator
@@ -6,9 +5,6 @@ from ..symbols_table import normalize_name
 from ..token import Token
 
 
-_logger = logging.getLogger(__name__)
-
-
 def _reduce_to_arg(var: Any) -> str:
     if isinstance(var, Token) and var.is_number:
         return var.valor
@@ -23,15 +19,14 @@ def base(op, arg1: Any = '', arg2: Any = '', res: Any = ''):
     arg1 = _reduce_to_arg(arg1)
     arg2 = _reduce_to_arg(arg2)
     res = _reduce_to_arg(res)
-    code = f'{op};{arg1};{arg2};{res}'
-    _logger.debug(code)
-    return code
+    return f'{op};{arg1};{arg2};{res}'
 
 
 class IntermediateCode(CodeGenerator):
     def __init__(self):
         super().__init__()
         self._if_stack = []
+        self._while_stack = []
 
     def inpp(self, ident: Token):
         pass
@@ -82,8 +77,16 @@ class IntermediateCode(CodeGenerator):
     def close_if(self):
         self.__pop_stack()
 
-    def while_(self, cond: Token):
-        pass
+    def while_(self):
+        line = len(self.code)
+        self._while_stack.append([line, None])
+
+    def do_(self, cond: Token):
+        self._while_stack[-1][1] = (len(self.code), cond)
+        self.code.append(None)
 
     def close_while(self):
-        pass
+        l1, (l2, cond) = self._while_stack.pop()
+        self.code.append(base('goto', l1))
+        next_line = len(self.code)
+        self.code[l2] = base('JF', cond, next_line)
@@ -1,10 +1,6 @@
-import logging
-
 from compilador.symbols_table import Symbol
 
 
-_logger = logging.getLogger(__name__)
-
 opcodes = {
     '/': 'DIVI',
     '*': 'MULT',
@@ -32,9 +28,7 @@ class ObjectCode:
         self._while_stack = []
 
     def _push(self, op: str, arg=''):
-        code = mkcode(op, arg)
-        _logger.debug(code)
-        self.code.append(code)
+        self.code.append(mkcode(op, arg))
 
     def inpp(self):
         self._push('INPP')
@@ -0,0 +1,300 @@
+import math
+
+from compilador.symbols_table import Symbol
+
+
+operators = {
+    '/': '/',
+    '*': '*',
+    '-': '-',
+    '+': '+',
+    '=': '==',
+    '<>': '!=',
+    '>=': '>=',
+    '<=': '<=',
+    '>': '>',
+    '<': '<',
+}
+
+# binding strength of each generated expression, used to avoid redundant
+# parentheses (deeply nested ones hit the python parser limits)
+_PREC_CMP = 0
+_PREC_ADD = 1
+_PREC_MUL = 2
+_PREC_UNARY = 3
+_PREC_ATOM = 4
+
+precedences = {
+    '/': _PREC_MUL,
+    '*': _PREC_MUL,
+    '-': _PREC_ADD,
+    '+': _PREC_ADD,
+}
+
+INDENT = '    '
+
+# python refuses more than 20 statically nested loops and 100 indentation
+# levels, deeper programs are generated as a flat state machine instead
+MAX_LOOPS = 16
+MAX_DEPTH = 90
+# nesting of a generated expression before it is assigned to a temporary,
+# so long chains stay under the recursion limits of the python compiler
+MAX_EXPR_DEPTH = 32
+
+# structure of the generated statements, replayed by _flatten
+LINE, IF, ELSE, END_IF, LOOP, TEST, END_LOOP, RETURN = range(8)
+
+
+def literal(value) -> str:
+    value = float(value)
+    if math.isfinite(value):
+        return repr(value)
+    return f'float({repr(value)!r})'
+
+
+def load(code: [str], filename: str = '<lalg>'):
+    """Function main(read, write) defined by lines of source generated by PythonCode."""
+    namespace = dict()
+    exec(compile('\n'.join(code) + '\n', filename, 'exec'), namespace)
+    return namespace['main']
+
+
+class PythonCode:
+    """
+    Generates python source from the same calls ObjectLexicon makes to ObjectCode.
+
+    Declared symbols become local variables and if/while become real python
+    statements. The generated function has the signature main(read, write),
+    where read() returns the next input value and write(value) outputs one.
+
+    Programs nested deeper than python allows are generated as a loop over
+    their basic blocks instead, see `_flatten`.
+    """
+
+    def __init__(self):
+        self.code = []
+        self.symbols = dict()
+        self._expr_stack = []
+        self._depth = 1
+        self._function = None
+        self._temps = 0
+        self._structure = []
+        self._loop_starts = []
+        self._max_loops = 0
+        self._max_depth = 1
+
+    @property
+    def source(self) -> str:
+        return '\n'.join(self.code) + '\n'
+
+    def build(self):
+        if self._function is None:
+            self._function = load(self.code)
+        return self._function
+
+    def _line(self, line: str):
+        self.code.append(INDENT * self._depth + line)
+        self._structure.append((LINE, line))
+
+    def _open(self, line: str):
+        self.code.append(INDENT * self._depth + line)
+        self._depth += 1
+        self._max_depth = max(self._max_depth, self._depth)
+
+    def _push_expr(self, expr: str, prec: int, depth: int = 1):
+        if depth > MAX_EXPR_DEPTH:
+            self._temps += 1
+            name = f't_{self._temps}'
+            self._line(f'{name} = {expr}')
+            expr, prec, depth = name, _PREC_ATOM, 1
+        self._expr_stack.append((expr, prec, depth))
+
+    def _pop_expr(self, min_prec=_PREC_CMP):
+        expr, prec, depth = self._expr_stack.pop()
+        if prec < min_prec:
+            expr = f'({expr})'
+        return expr, depth
+
+    def inpp(self):
+        self.code.append('def main(read, write):')
+
+    def alme(self, res):
+        name = f'v_{res}'
+        self.symbols[res] = name
+        self._line(f'{name} = 0')
+        return name
+
+    def read(self, var: Symbol):
+        self._line(f'{var.data} = read()')
+
+    def write(self, var: Symbol):
+        self._line(f'write({var.data})')
+
+    def para(self):
+        self.code.append(INDENT * self._depth + 'return')
+        self._structure.append((RETURN,))
+        if self._max_loops > MAX_LOOPS or self._max_depth > MAX_DEPTH:
+            self._flatten()
+
+    def uminus(self):
+        expr, depth = self._pop_expr(_PREC_UNARY)
+        self._push_expr(f'-{expr}', _PREC_UNARY, depth + 1)
+
+    def stack(self, token):
+        if isinstance(token, Symbol):
+            self._push_expr(token.data, _PREC_ATOM)
+        else:
+            value = literal(token)
+            prec = _PREC_UNARY if value.startswith('-') else _PREC_ATOM
+            self._push_expr(value, prec)
+
+    def op(self, op):
+        prec = precedences.get(op, _PREC_CMP)
+        # operators are left associative: the right operand needs parentheses
+        # unless it binds strictly tighter, so float evaluation order is kept
+        right, right_depth = self._pop_expr(prec + 1)
+        left, left_depth = self._pop_expr(prec if prec != _PREC_CMP else _PREC_ADD)
+        self._push_expr(f'{left} {operators[op]} {right}', prec, max(left_depth, right_depth) + 1)
+
+    def if_(self):
+        cond, _ = self._pop_expr()
+        self._structure.append((IF, cond))
+        self._open(f'if {cond}:')
+
+    def else_(self):
+        self._structure.append((ELSE,))
+        self._depth -= 1
+        self._open('else:')
+
+    def close_if(self):
+        self._structure.append((END_IF,))
+        self._depth -= 1
+
+    def while_(self):
+        self._structure.append((LOOP,))
+        self._loop_starts.append(len(self.code))
+        self._max_loops = max(self._max_loops, len(self._loop_starts))
+
+    def do_(self):
+        cond, _ = self._pop_expr()
+        self._structure.append((TEST, cond))
+
+        start = self._loop_starts[-1]
+        if len(self.code) == start:
+            self._open(f'while {cond}:')
+            return
+
+        # temporaries of the condition must be computed on every iteration
+        spilled = self.code[start:]
+        del self.code[start:]
+        self._open('while True:')
+        for line in spilled:
+            self.code.append(INDENT + line)
+        # only the structured form needs the break, _flatten tests at the head
+        self.code.append(INDENT * self._depth + f'if not {cond}: break')
+
+    def close_while(self):
+        self._structure.append((END_LOOP,))
+        self._loop_starts.pop()
+        self._depth -= 1
+
+    def assign(self, var: Symbol):
+        expr, _ = self._pop_expr()
+        self._line(f'{var.data} = {expr}')
+
+    def _flatten(self):
+        """
+        Generate the program again as basic blocks run by a dispatch loop.
+
+        Each block ends by setting `pc` to the next block, and blocks are
+        found by a binary search on `pc`, so neither the loops nor the
+        dispatch nest deeper than python allows.
+        """
+        blocks = [[]]
+        # next block: an index, [cond, then, else] or None for return
+        exits = [None]
+        open_ = []
+        current = 0
+
+        def new_block():
+            blocks.append([])
+            exits.append(None)
+            return len(blocks) - 1
+
+        for item in self._structure:
+            kind = item[0]
+            if kind == LINE:
+                blocks[current].append(item[1])
+            elif kind == IF:
+                then = new_block()
+                exits[current] = [item[1], then, None]
+                open_.append((current, None))
+                current = then
+            elif kind == ELSE:
+                branch, _ = open_.pop()
+                else_ = new_block()
+                exits[branch][2] = else_
+                open_.append((branch, current))
+                current = else_
+            elif kind == END_IF:
+                branch, then_end = open_.pop()
+                after = new_block()
+                if then_end is None:
+                    exits[branch][2] = after
+                else:
+                    exits[then_end] = after
+                exits[current] = after
+                current = after
+            elif kind == LOOP:
+                head = new_block()
+                exits[current] = head
+                open_.append(head)
+                current = head
+            elif kind == TEST:
+                head = open_.pop()
+                body = new_block()
+                exits[current] = [item[1], body, None]
+                open_.append((head, current))
+                current = body
+            elif kind == END_LOOP:
+                head, test = open_.pop()
+                exits[current] = head
+                after = new_block()
+                exits[test][2] = after
+                current = after
+            else:
+                exits[current] = None
+
+        del self.code[1:]
+        self.code.append(INDENT + 'pc = 0')
+        self.code.append(INDENT + 'while True:')
+
+        # explicit stack of (first block, end, depth), or a line to write
+        pending = [(0, len(blocks), 2)]
+        while pending:
+            item = pending.pop()
+            if isinstance(item, str):
+                self.code.append(item)
+                continue
+
+            first, end, depth = item
+            indent = INDENT * depth
+            if end - first > 1:
+                middle = (first + end) // 2
+                # pushed in reverse, the first half is written first
+                pending.append((middle, end, depth + 1))
+                pending.append(indent + 'else:')
+                pending.append((first, middle, depth + 1))
+                self.code.append(f'{indent}if pc < {middle}:')
+                continue
+
+            for line in blocks[first]:
+                self.code.append(indent + line)
+            exit_ = exits[first]
+            if exit_ is None:
+                self.code.append(indent + 'return')
+            elif isinstance(exit_, int):
+                self.code.append(f'{indent}pc = {exit_}')
+            else:
+                cond, then, else_ = exit_
+                self.code.append(f'{indent}pc = {then} if {cond} else {else_}')
@@ -56,7 +56,11 @@ class CodeGenerator(ABC):
         pass
 
     @abstractmethod
-    def while_(self, cond: Token):
+    def while_(self):
+        pass
+
+    @abstractmethod
+    def do_(self, cond: Token):
         pass
 
     @abstractmethod
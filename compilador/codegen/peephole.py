@@ -0,0 +1,216 @@
+import logging
+import operator
+from collections import Counter
+
+from .ObjectCode import mkcode
+
+
+_logger = logging.getLogger(__name__)
+
+jumps = {'DSVI', 'DSVF'}
+# fused compare-and-branch instructions, the target is their last operand
+branches = {'DFVV', 'DFVC'}
+
+foldable = {
+    'SOMA': operator.add,
+    'SUBT': operator.sub,
+    'MULT': operator.mul,
+    'DIVI': operator.truediv,
+    'CPME': lambda a, b: 1.0 if a < b else 0.0,
+    'CPMA': lambda a, b: 1.0 if a > b else 0.0,
+    'CPIG': lambda a, b: 1.0 if a == b else 0.0,
+    'CDES': lambda a, b: 1.0 if a != b else 0.0,
+    'CPMI': lambda a, b: 1.0 if a <= b else 0.0,
+    'CMAI': lambda a, b: 1.0 if a >= b else 0.0,
+}
+
+
+def split_code(code: str) -> list:
+    op, _, arg = code.partition(' ')
+    arg = arg.strip()
+    if op in jumps or op == 'ALME':
+        arg = int(arg)
+    elif op in branches:
+        arg = arg.split()
+        arg[-1] = int(arg[-1])
+    return [op, arg]
+
+
+def join_code(op: str, arg) -> str:
+    if isinstance(arg, list):
+        arg = ' '.join(map(str, arg))
+    return mkcode(op, arg)
+
+
+def jump_targets(instructions: list) -> set:
+    targets = set()
+    for op, arg in instructions:
+        if op in jumps:
+            targets.add(arg)
+        elif op in branches:
+            targets.add(arg[-1])
+    return targets
+
+
+def relocate(instructions: list, keep: [bool]) -> list:
+    """
+    Drop the instructions not marked in `keep`, relocating jump targets.
+
+    A target pointing to a removed instruction moves to the next kept one.
+    """
+    new_pos = []
+    pos = 0
+    for k in keep:
+        new_pos.append(pos)
+        pos += k
+    new_pos.append(pos)
+
+    code = []
+    for (op, arg), k in zip(instructions, keep):
+        if k:
+            if op in jumps:
+                arg = new_pos[arg]
+            elif op in branches:
+                arg = arg[:-1] + [new_pos[arg[-1]]]
+            code.append([op, arg])
+    return code
+
+
+class PeepholeOptimizer:
+    """
+    Rewrites small windows of ObjectCode output until nothing else changes.
+
+    Rewrites never look past a jump target, so every window is entered only
+    through its first instruction. DSVI/DSVF targets are relocated after each
+    pass; a target pointing to a removed instruction moves to the next
+    remaining one.
+    """
+
+    def __init__(self, code: [str]):
+        self.original_size = len(code)
+        self.instructions = [split_code(c) for c in code]
+        self.rewrites = Counter()
+
+    @property
+    def removed(self) -> int:
+        return self.original_size - len(self.instructions)
+
+    @property
+    def code(self) -> [str]:
+        return [join_code(op, arg) for op, arg in self.instructions]
+
+    def optimize(self) -> [str]:
+        changed = True
+        while changed:
+            changed = self._thread_jumps()
+            changed = self._rewrite() or changed
+        _logger.debug(f'peephole: {self.removed} instructions removed {dict(self.rewrites)}')
+        return self.code
+
+    def _thread_jumps(self) -> bool:
+        code = self.instructions
+        changed = False
+        for ins in code:
+            if ins[0] not in jumps:
+                continue
+
+            target = ins[1]
+            seen = set()
+            while target < len(code) and code[target][0] == 'DSVI' and target not in seen:
+                seen.add(target)
+                target = code[target][1]
+
+            if target != ins[1]:
+                ins[1] = target
+                self.rewrites['jump threading'] += 1
+                changed = True
+        return changed
+
+    def _rewrite(self) -> bool:
+        code = self.instructions
+        targets = jump_targets(code)
+        keep = [True] * len(code)
+
+        def window(i, size):
+            # instructions i+1 .. i+size-1 must be live and not jump targets
+            if i + size > len(code):
+                return None
+            for j in range(i + 1, i + size):
+                if j in targets:
+                    return None
+            return code[i:i + size]
+
+        i = 0
+        while i < len(code):
+            op, arg = code[i]
+
+            w = window(i, 3)
+            if w and w[0][0] == 'CRCT' and w[1][0] == 'CRCT' and w[2][0] in foldable:
+                a = float(w[0][1])
+                b = float(w[1][1])
+                if not (w[2][0] == 'DIVI' and b == 0):
+                    code[i] = ['CRCT', repr(foldable[w[2][0]](a, b))]
+                    keep[i + 1] = keep[i + 2] = False
+                    self.rewrites['constant folding'] += 1
+                    i += 3
+                    continue
+
+            w = window(i, 2)
+            if w:
+                (op1, arg1), (op2, arg2) = w
+                if op1 == 'ALME' and op2 == 'ALME':
+                    # merge in place so longer runs keep collapsing on this pass
+                    code[i + 1] = ['ALME', arg1 + arg2]
+                    keep[i] = False
+                    self.rewrites['ALME coalescing'] += 1
+                    i += 1
+                    continue
+                if op1 == 'CRCT' and op2 == 'INVE':
+                    code[i] = ['CRCT', repr(float(arg1) * -1)]
+                    keep[i + 1] = False
+                    self.rewrites['constant folding'] += 1
+                    i += 2
+                    continue
+                if op1 == 'INVE' and op2 == 'INVE':
+                    keep[i] = keep[i + 1] = False
+                    self.rewrites['double negation'] += 1
+                    i += 2
+                    continue
+                if op1 == 'CRVL' and op2 == 'ARMZ' and arg1 == arg2:
+                    keep[i] = keep[i + 1] = False
+                    self.rewrites['self assignment'] += 1
+                    i += 2
+                    continue
+                if op1 == 'CRCT' and op2 == 'DSVF':
+                    if float(arg1) == 0:
+                        code[i] = ['DSVI', arg2]
+                    else:
+                        keep[i] = False
+                    keep[i + 1] = False
+                    self.rewrites['constant branch'] += 1
+                    i += 2
+                    continue
+
+            if op == 'DSVI':
+                j = i + 1
+                while j < len(code) and j not in targets:
+                    keep[j] = False
+                    self.rewrites['unreachable code'] += 1
+                    j += 1
+                if arg == j:
+                    keep[i] = False
+                    self.rewrites['jump to next'] += 1
+                i = j
+                continue
+
+            i += 1
+
+        if all(keep):
+            return False
+
+        self.instructions = relocate(code, keep)
+        return True
+
+
+def optimize(code: [str]) -> [str]:
+    return PeepholeOptimizer(code).optimize()
@@ -0,0 +1,109 @@
+import logging
+from collections import Counter
+
+from .peephole import join_code, jump_targets, relocate, split_code
+
+
+_logger = logging.getLogger(__name__)
+
+arithmetic = {'SOMA', 'SUBT', 'MULT', 'DIVI'}
+comparisons = {'CPME', 'CPMA', 'CPIG', 'CDES', 'CPMI', 'CMAI'}
+
+
+class SuperinstructionFuser:
+    """
+    Replaces common ObjectCode sequences by fused superinstructions.
+
+    INCR a k            CRVL a; CRCT k; SOMA|SUBT; ARMZ a   (or CRCT k; CRVL a; SOMA; ARMZ a)
+    DFVV op a b p       CRVL a; CRVL b; <comparison>; DSVF p
+    DFVC op a k p       CRVL a; CRCT k; <comparison>; DSVF p
+    OPVV op a b         CRVL a; CRVL b; <arithmetic>
+    OPVC op a k         CRVL a; CRCT k; <arithmetic>
+    ARCT a k            CRCT k; ARMZ a
+
+    Like the peephole optimizer, sequences are only fused when no jump lands
+    inside them, and jump targets are relocated afterwards.
+    """
+
+    def __init__(self, code: [str]):
+        self.original_size = len(code)
+        self.instructions = [split_code(c) for c in code]
+        self.fused = Counter()
+
+    @property
+    def removed(self) -> int:
+        return self.original_size - len(self.instructions)
+
+    @property
+    def code(self) -> [str]:
+        return [join_code(op, arg) for op, arg in self.instructions]
+
+    def fuse(self) -> [str]:
+        code = self.instructions
+        targets = jump_targets(code)
+        keep = [True] * len(code)
+
+        i = 0
+        while i < len(code):
+            for size, matcher in ((4, self._match4), (3, self._match3), (2, self._match2)):
+                if i + size > len(code) or any(j in targets for j in range(i + 1, i + size)):
+                    continue
+                fused = matcher(code[i:i + size])
+                if fused is not None:
+                    code[i] = fused
+                    for j in range(i + 1, i + size):
+                        keep[j] = False
+                    self.fused[fused[0]] += 1
+                    i += size
+                    break
+            else:
+                i += 1
+
+        self.instructions = relocate(code, keep)
+        _logger.debug(f'superinstructions: {dict(self.fused)}')
+        return self.code
+
+    @staticmethod
+    def _match4(w):
+        (op1, arg1), (op2, arg2), (op3, _), (op4, arg4) = w
+
+        if op3 in ('SOMA', 'SUBT') and op4 == 'ARMZ':
+            if op1 == 'CRVL' and op2 == 'CRCT' and arg1 == arg4:
+                # x - k is exactly x + (-k)
+                k = arg2 if op3 == 'SOMA' else repr(float(arg2) * -1)
+                return ['INCR', [arg1, k]]
+            if op1 == 'CRCT' and op2 == 'CRVL' and op3 == 'SOMA' and arg2 == arg4:
+                return ['INCR', [arg2, arg1]]
+
+        if op1 == 'CRVL' and op3 in comparisons and op4 == 'DSVF':
+            if op2 == 'CRVL':
+                return ['DFVV', [op3, arg1, arg2, arg4]]
+            if op2 == 'CRCT':
+                return ['DFVC', [op3, arg1, arg2, arg4]]
+
+        return None
+
+    @staticmethod
+    def _match3(w):
+        (op1, arg1), (op2, arg2), (op3, _) = w
+
+        if op1 == 'CRVL' and op3 in arithmetic:
+            if op2 == 'CRVL':
+                return ['OPVV', [op3, arg1, arg2]]
+            if op2 == 'CRCT':
+                return ['OPVC', [op3, arg1, arg2]]
+
+        return None
+
+    @staticmethod
+    def _match2(w):
+        (op1, arg1), (op2, arg2) = w
+
+        if op1 == 'CRCT' and op2 == 'ARMZ':
+            return ['ARCT', [arg2, arg1]]
+
+        return None
+
+
+def fuse(code: [str]) -> [str]:
+    return SuperinstructionFuser(code).fuse()
@@ -0,0 +1,178 @@
+"""
+Backends driven by the syntax tree of AstLexicon.
+
+A program parsed once can be walked by any number of them: StackWalker
+generates the stack code of ObjectLexicon, QuadrupleWalker the quadruples
+of Lexicon.
+"""
+from .IntermediateCode import IntermediateCode
+from .ObjectCode import ObjectCode
+from ._base import CodeGenerator
+from .peephole import PeepholeOptimizer
+from .superinstructions import SuperinstructionFuser
+from ..errors import CompilerError, CompilerSemanticError
+from ..lexicon.expressions import BinOp, emit, fold, Neg
+from ..lexicon.syntax import Assign, If, Program, Read, Write
+from ..symbols_table import SymbolsTable
+from ..token import REAL, Token
+
+
+class StackWalker:
+    """
+    Stack code for ObjectCode and compatible compilers (PythonCode).
+
+    Sets `Symbol.data` of the declared symbols to what the compiler returns
+    for them, so walking the same tree with another stack backend replaces it.
+    """
+
+    def __init__(self, compiler=None, optimize=False, fuse=False):
+        self.compiler = ObjectCode() if compiler is None else compiler
+        self.optimize = optimize
+        self.optimizer = None
+        self.fuse = fuse
+        self.fuser = None
+
+    def generate(self, program: Program) -> [str]:
+        compiler = self.compiler
+        compiler.inpp()
+        for symbol in program.declarations:
+            symbol.data = compiler.alme(symbol.name)
+
+        self.emit_block(program.body)
+        compiler.para()
+
+        if self.optimize:
+            self.optimizer = PeepholeOptimizer(compiler.code)
+            compiler.code = self.optimizer.optimize()
+
+        if self.fuse:
+            self.fuser = SuperinstructionFuser(compiler.code)
+            compiler.code = self.fuser.fuse()
+
+        return compiler.code
+
+    def emit_block(self, block: list):
+        """Emit a list of statements, jumps are relative to the current end of the code."""
+        compiler = self.compiler
+        for stmt in block:
+            kind = type(stmt)
+            if kind is Assign:
+                emit(compiler, fold(stmt.expr))
+                compiler.assign(stmt.target.symbol)
+            elif kind is Read:
+                compiler.read(stmt.target.symbol)
+            elif kind is Write:
+                compiler.write(stmt.source.symbol)
+            elif kind is If:
+                emit(compiler, fold(stmt.cond))
+                compiler.if_()
+                self.emit_block(stmt.then)
+                if stmt.else_ is not None:
+                    compiler.else_()
+                    self.emit_block(stmt.else_)
+                compiler.close_if()
+            else:
+                compiler.while_()
+                emit(compiler, fold(stmt.cond))
+                compiler.do_()
+                self.emit_block(stmt.body)
+                compiler.close_while()
+
+
+class QuadrupleWalker:
+    """
+    Quadruples for IntermediateCode, with the type checks of Lexicon.
+
+    Temporaries are made in a copy of the program symbols, so the tree can
+    still be walked by other backends afterwards.
+    """
+
+    def __init__(self, compiler: CodeGenerator = None):
+        self.compiler = IntermediateCode() if compiler is None else compiler
+        self.symbols = None
+
+    def generate(self, program: Program) -> [str]:
+        self.symbols = SymbolsTable()
+        self.symbols.symbols.update(program.symbols.symbols)
+
+        compiler = self.compiler
+        try:
+            compiler.inpp(program.name)
+            for symbol in program.declarations:
+                compiler.alme('0.0' if symbol.type == REAL else '0', symbol.name)
+
+            self._block(program.body)
+            compiler.para()
+        except CompilerError as err:
+            if program.tape is not None:
+                err.locate(program.tape)
+            raise
+
+        return compiler.code
+
+    def typeof(self, var: Token):
+        if var.is_number:
+            return var.tipo
+        return self.symbols.typeof(var)
+
+    def validate_same_type_op(self, arg1: Token, arg2: Token, op: str):
+        if self.typeof(arg1) != self.typeof(arg2):
+            msg = (
+                'Operação não é permitida entre tipos diferentes '
+                f'(<{self.typeof(arg1).name}> e <{self.typeof(arg2).name}>):\n'
+                f'\t{arg1!r} {op} {arg2!r}\n')
+            # temporaries have no position
+            raise CompilerSemanticError(msg, arg1.start if arg1.start is not None else arg2.start)
+
+    def _block(self, block: list):
+        compiler = self.compiler
+        for stmt in block:
+            kind = type(stmt)
+            if kind is Assign:
+                ident = stmt.target.token
+                termo = self._expression(stmt.expr)
+                self.validate_same_type_op(ident, termo, ':=')
+                compiler.op(':=', termo, res=ident)
+            elif kind is Read:
+                compiler.read(stmt.target.symbol.name)
+            elif kind is Write:
+                compiler.write(stmt.source.symbol.name)
+            elif kind is If:
+                compiler.if_(self._expression(stmt.cond))
+                self._block(stmt.then)
+                if stmt.else_ is not None:
+                    compiler.else_()
+                    self._block(stmt.else_)
+                compiler.close_if()
+            else:
+                compiler.while_()
+                compiler.do_(self._expression(stmt.cond))
+                self._block(stmt.body)
+                compiler.close_while()
+
+    def _expression(self, expr) -> Token:
+        """Emit the operations of an expression, returning the token holding its value."""
+        # explicit stack, in the order Lexicon makes its temporaries
+        pending = [expr]
+        values = []
+        while pending:
+            node = pending.pop()
+            if isinstance(node, str):
+                right = values.pop()
+                left = values.pop()
+                self.validate_same_type_op(left, right, node)
+                tmp = self.symbols.make_temp(self.typeof(left))
+                self.compiler.op(node, left, right, tmp)
+                values.append(tmp)
+            elif node is None:
+                operand = values.pop()
+                tmp = self.symbols.make_temp(self.typeof(operand))
+                self.compiler.uminus(operand.valor, tmp.valor)
+                values.append(tmp)
+            elif isinstance(node, BinOp):
+                pending.extend((node.op, node.right, node.left))
+            elif isinstance(node, Neg):
+                pending.extend((None, node.operand))
+            else:
+                values.append(node.token)
+        return values.pop()
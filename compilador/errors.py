@@ -5,41 +5,100 @@ def _invalid_token(token: Token):
     return f'Token inválido: {token!r}'
 
 
+def _offset(found):
+    return found.start if isinstance(found, Token) else None
+
+
+# widest source excerpt shown in a diagnostic
+excerpt_size = 80
+
+
 class CompilerError(Exception):
-    def __init__(self, error_type, msg):
-        # TODO: implement trace
+    """
+    Compilation error, optionally tied to an absolute offset in the source.
+
+    The line, column and excerpt are only looked up by `locate`, once the
+    error reached the parser, so successful compiles never index lines.
+    """
+
+    def __init__(self, error_type, msg, offset: int = None):
+        self.error_type = error_type
+        self.msg = msg
+        self.offset = offset
+        self.filepath = None
+        self.location = None
+        super().__init__(self._format())
+
+    def _format(self):
         c = '#'
         size = 50
-        header_msg = f'ERRO {error_type}'.upper().center(size - 4)
+        header_msg = f'ERRO {self.error_type}'.upper().center(size - 4)
         header_border = c * (len(header_msg) + 4)
-        msg = '\n'.join(
-            [
-                '',
-                header_border,
-                f'{c} {header_msg} {c}',
-                header_border,
-                f'  > {msg}'
-            ])
-        super().__init__(msg)
+        lines = [
+            '',
+            header_border,
+            f'{c} {header_msg} {c}',
+            header_border,
+            f'  > {self.msg}'
+        ]
+
+        if self.location is not None:
+            line, column, text, index = self.location
+            where = f'linha {line}, coluna {column}'
+            if self.filepath:
+                where = f'{self.filepath}, {where}'
+
+            if len(text) > excerpt_size:
+                start = max(0, index - excerpt_size // 2)
+                text = text[start:start + excerpt_size]
+                index -= start
+
+            # keep tabs so the caret lines up with the excerpt
+            padding = ''.join(ch if ch == '\t' else ' ' for ch in text[:index])
+            lines += [
+                f'  em {where}:',
+                f'    {text}',
+                f'    {padding}^',
+            ]
+
+        return '\n'.join(lines)
+
+    def locate(self, tape, offset: int = None):
+        """
+        Resolve the error position in `tape`, using `offset` if the error has none.
+
+        :return: the error itself, so it can be re-raised
+        """
+        if self.offset is None:
+            self.offset = offset
+
+        if self.offset is not None:
+            self.location = tape.location(self.offset)
+            self.filepath = getattr(tape, 'filepath', None)
+            self.args = (self._format(),)
+
+        return self
 
 
 class CompilerSyntaxError(CompilerError):
-    def __init__(self, msg):
-        super().__init__('SINTÁTICO', msg)
+    def __init__(self, msg, offset: int = None):
+        super().__init__('SINTÁTICO', msg, offset)
 
     @classmethod
-    def simples(cls, expected, found):
-        return cls(f'Esperado {expected}, encontrado {found}')
+    def simples(cls, expected, found, offset: int = None):
+        if offset is None:
+            offset = _offset(found)
+        return cls(f'Esperado {expected}, encontrado {found}', offset)
 
     @classmethod
     def invalid_token(cls, token: Token):
-        return cls(_invalid_token(token))
+        return cls(_invalid_token(token), _offset(token))
 
 
 class CompilerSemanticError(CompilerError):
-    def __init__(self, msg):
-        super().__init__('SEMÂNTICO', msg)
+    def __init__(self, msg, offset: int = None):
+        super().__init__('SEMÂNTICO', msg, offset)
 
     @classmethod
     def invalid_token(cls, token: Token):
-        return cls(_invalid_token(token))
+        return cls(_invalid_token(token), _offset(token))
@@ -0,0 +1,235 @@
+"""
+LL(1) parser generator for grammars written like dados/lalg.txt.
+
+Productions are `<nonterminal> -> symbols`, with alternatives on lines
+starting with `|` and `λ` for the empty production. Any other word or
+character is a terminal. Symbols starting with `#` are semantic actions:
+they take no input and are ignored when building the table.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+
+GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), os.pardir, 'dados', 'lalg.txt')
+
+EPSILON = 'λ'
+EOF = 'EOF'
+
+# bump when the cached table format changes
+TABLE_VERSION = 1
+
+_symbol = re.compile(r'<[a-z_]+>|#[a-z_]+|λ|:=|<>|>=|<=|[A-Za-z_]+|\S')
+_production = re.compile(r'^(<[a-z_]+>)\s*->(.*)$')
+
+
+def is_nonterminal(symbol: str) -> bool:
+    # '<', '<>' and '<=' are terminals
+    return len(symbol) > 2 and symbol[0] == '<' and symbol[-1] == '>'
+
+
+def is_action(symbol: str) -> bool:
+    return symbol.startswith('#')
+
+
+def _symbols(text):
+    # λ only marks an empty production, it may still be followed by actions
+    return tuple(s for s in _symbol.findall(text) if s != EPSILON)
+
+
+def read_productions(text: str) -> [(str, tuple)]:
+    productions = []
+    lhs = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('-'):
+            continue
+
+        m = _production.match(line)
+        if m:
+            lhs, rhs = m.groups()
+        elif line.startswith('|') and lhs is not None:
+            rhs = line[1:]
+        else:
+            raise ValueError(f'Linha inválida na gramática: {line!r}')
+
+        productions.append((lhs, _symbols(rhs)))
+
+    return productions
+
+
+class Grammar:
+    def __init__(self, productions: [(str, tuple)], start: str = None):
+        """
+        :param productions: list of (nonterminal, symbols) pairs
+        :param start:       start symbol, the first nonterminal by default
+        """
+        self.productions = [(lhs, tuple(rhs)) for lhs, rhs in productions]
+        self.start = productions[0][0] if start is None else start
+
+        self.nonterminals = []
+        for lhs, _ in self.productions:
+            if lhs not in self.nonterminals:
+                self.nonterminals.append(lhs)
+
+        self.terminals = sorted({
+            s for _, rhs in self.productions for s in rhs
+            if not is_nonterminal(s) and not is_action(s)})
+
+        for _, rhs in self.productions:
+            for s in rhs:
+                if is_nonterminal(s) and s not in self.nonterminals:
+                    raise ValueError(f'Não terminal sem produções: {s}')
+
+    @classmethod
+    def parse(cls, text: str):
+        return cls(read_productions(text))
+
+    @classmethod
+    def from_file(cls, filepath: str = GRAMMAR_PATH):
+        with open(filepath, 'rt', encoding='utf-8') as f:
+            return cls.parse(f.read())
+
+    def annotate(self, text: str):
+        """
+        Return a copy with the semantic actions of `text` inserted.
+
+        `text` holds productions in the same format with `#action` symbols.
+        Without its actions each one must be a production of this grammar,
+        which it replaces in place, so production numbers do not change.
+        """
+        productions = list(self.productions)
+        for lhs, rhs in read_productions(text):
+            plain = tuple(s for s in rhs if not is_action(s))
+            try:
+                i = productions.index((lhs, plain))
+            except ValueError:
+                raise ValueError(
+                    f'Produção não existe na gramática: {lhs} -> {" ".join(plain) or EPSILON}') from None
+            productions[i] = (lhs, rhs)
+
+        return Grammar(productions, self.start)
+
+    def first_sets(self) -> {str: set}:
+        """FIRST of every nonterminal, with EPSILON for the nullable ones."""
+        first = {nt: set() for nt in self.nonterminals}
+        changed = True
+        while changed:
+            changed = False
+            for lhs, rhs in self.productions:
+                before = len(first[lhs])
+                first[lhs] |= self._first_of(rhs, first)
+                changed |= len(first[lhs]) != before
+        return first
+
+    @staticmethod
+    def _first_of(symbols, first) -> set:
+        result = set()
+        for s in symbols:
+            if is_action(s):
+                continue
+            if not is_nonterminal(s):
+                result.add(s)
+                return result
+            result |= first[s] - {EPSILON}
+            if EPSILON not in first[s]:
+                return result
+        result.add(EPSILON)
+        return result
+
+    def follow_sets(self, first=None) -> {str: set}:
+        if first is None:
+            first = self.first_sets()
+
+        follow = {nt: set() for nt in self.nonterminals}
+        follow[self.start].add(EOF)
+        changed = True
+        while changed:
+            changed = False
+            for lhs, rhs in self.productions:
+                for i, s in enumerate(rhs):
+                    if not is_nonterminal(s):
+                        continue
+                    before = len(follow[s])
+                    rest = self._first_of(rhs[i + 1:], first)
+                    follow[s] |= rest - {EPSILON}
+                    if EPSILON in rest:
+                        follow[s] |= follow[lhs]
+                    changed |= len(follow[s]) != before
+        return follow
+
+    def ll1_table(self) -> {str: {str: int}}:
+        """
+        Map each nonterminal and lookahead terminal to a production number.
+
+        Raises ValueError if the grammar is not LL(1).
+        """
+        first = self.first_sets()
+        follow = self.follow_sets(first)
+
+        table = {nt: dict() for nt in self.nonterminals}
+        for i, (lhs, rhs) in enumerate(self.productions):
+            lookahead = self._first_of(rhs, first)
+            if EPSILON in lookahead:
+                lookahead = (lookahead - {EPSILON}) | follow[lhs]
+
+            for terminal in lookahead:
+                other = table[lhs].setdefault(terminal, i)
+                if other != i:
+                    raise ValueError(
+                        f'Gramática não é LL(1): conflito em {lhs} com {terminal!r} '
+                        f'entre as produções {other} e {i}')
+        return table
+
+
+def _cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'compilador')
+
+
+def load_table(filepath: str = GRAMMAR_PATH, cache_dir: str = None):
+    """
+    Return the grammar in `filepath` and its LL(1) table.
+
+    The table is cached in `cache_dir` under the sha256 of the grammar text,
+    so it is only computed again when the grammar changes. The cache is
+    skipped if the directory cannot be written.
+    """
+    with open(filepath, 'rt', encoding='utf-8') as f:
+        text = f.read()
+
+    key = hashlib.sha256(f'{TABLE_VERSION}\0{text}'.encode()).hexdigest()
+    cache_dir = _cache_dir() if cache_dir is None else cache_dir
+    path = os.path.join(cache_dir, f'll1-{key}.json')
+
+    try:
+        with open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        return Grammar(data['productions'], data['start']), data['table']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    grammar = Grammar.parse(text)
+    table = grammar.ll1_table()
+
+    data = json.dumps({
+        'start': grammar.start,
+        'productions': grammar.productions,
+        'table': table,
+    })
+    with contextlib.suppress(OSError):
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wt', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp)
+            raise
+
+    return grammar, table
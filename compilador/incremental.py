@@ -0,0 +1,514 @@
+"""
+Incremental compilation of a source that is being edited.
+
+The program body is split in segments, at first one per top-level
+statement: the text from the start of a statement to the start of the
+next one, with its ';', whitespace and comments. An edit inside a segment
+re-tokenizes and re-parses only that segment and regenerates only its
+code. Segment lengths and line counts are kept in Fenwick trees, so
+locating an edit costs O(log n) and the rest of the work depends on the
+size of the edited statement, not of the file.
+"""
+import logging
+
+from .codegen.ObjectCode import mkcode, ObjectCode
+from .codegen.walkers import StackWalker
+from .errors import CompilerError, CompilerSyntaxError
+from .lexicon.ast_lexicon import AstLexicon
+from .lexicon.expressions import BinOp, Neg, Var
+from .lexicon.helpers import validate_symbol
+from .lexicon.keywords import Keywords
+from .lexicon.syntax import Assign, If, Program, Read, While, Write
+from .symbols_table import SymbolsTable
+from .tape import TextTape
+from .tokenizer import Tokenizer
+
+
+_logger = logging.getLogger(__name__)
+
+
+class _Spill(Exception):
+    """The fragment cannot be parsed on its own: it continues in the text after it."""
+
+
+class _Fenwick:
+    """Prefix sums of a list of ints, updated and searched in O(log n)."""
+
+    def __init__(self, values: [int]):
+        tree = [0]
+        tree.extend(values)
+        size = len(tree)
+        for i in range(1, size):
+            j = i + (i & -i)
+            if j < size:
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def add(self, i: int, delta: int):
+        tree = self._tree
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i: int) -> int:
+        """Sum of the first i values."""
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, total: int) -> int:
+        """First i with prefix(i + 1) > total, or the number of values if there is none."""
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            j = pos + step
+            if j < len(tree) and tree[j] <= total:
+                pos = j
+                total -= tree[j]
+            step >>= 1
+        return pos
+
+
+class _Segment:
+    __slots__ = ('text', 'block', 'code', 'names', 'error')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.block = []
+        # code of the block, with jumps relative to its first instruction
+        self.code = []
+        # names of the variables used by the block
+        self.names = frozenset()
+        self.error = None
+
+
+def _names(block: list) -> frozenset:
+    names = set()
+    pending = list(block)
+    while pending:
+        node = pending.pop()
+        kind = type(node)
+        if kind is Var:
+            names.add(node.symbol.name)
+        elif kind is BinOp:
+            pending += node.left, node.right
+        elif kind is Neg:
+            pending.append(node.operand)
+        elif kind is Assign:
+            pending += node.target, node.expr
+        elif kind is If:
+            pending.append(node.cond)
+            pending += node.then
+            pending += node.else_ or ()
+        elif kind is While:
+            pending.append(node.cond)
+            pending += node.body
+        elif kind is Read:
+            pending.append(node.target)
+        elif kind is Write:
+            pending.append(node.source)
+    return frozenset(names)
+
+
+class FragmentLexicon(AstLexicon):
+    """AstLexicon for parts of a program: its header or a run of top-level statements."""
+
+    def __init__(self, text: str, filepath: str = None, symbols: SymbolsTable = None, tokenizer=Tokenizer):
+        super().__init__(TextTape(text, filepath), tokenizer)
+        if symbols is not None:
+            self.symbols = symbols
+
+    def _run(self, production):
+        try:
+            return production()
+        except EOFError:
+            raise _Spill() from None
+        except CompilerError as err:
+            # errors without a position point at the last token read
+            last = self.tokens.last
+            raise err.locate(self.tape, last and last.start)
+
+    def _at_end(self) -> bool:
+        try:
+            self.tokens.peek()
+        except EOFError:
+            if self.tape.is_eof():
+                return True
+            # a comment that is not closed in the fragment
+            raise
+        return False
+
+    def _header(self):
+        token = self._next_token()
+        if not token == Keywords.PROGRAM.value:
+            raise Keywords.PROGRAM.wrong_token_err(token)
+
+        name = self._get_ident()
+        declarations = self._dc()
+
+        token = self._next_token()
+        if not token == Keywords.BEGIN:
+            raise Keywords.BEGIN.wrong_token_err(token)
+
+        return name, declarations
+
+    def program(self):
+        """
+        Parse a whole program, keeping where its top-level statements start.
+
+        :return: name, declarations, start offset of each top-level statement,
+                 the statements and the offset of the closing 'end'
+        """
+        def parse():
+            name, declarations = self._header()
+
+            starts = []
+            body = []
+            while True:
+                starts.append(self.tokens.peek().start)
+                body.append(self._comando())
+                if not self._mais_comandos():
+                    break
+
+            end = self.tokens.peek().start
+            token = self._next_token()
+            if not token == Keywords.END:
+                raise Keywords.END.wrong_token_err(token)
+            validate_symbol(self._next_token(), '.')
+
+            try:
+                token = self._next_token()
+            except EOFError:
+                pass
+            else:
+                raise CompilerSyntaxError.simples('EOF', token)
+
+            return name, declarations, starts, body, end
+
+        return self._run(parse)
+
+    def header(self):
+        """Parse `program ident <dc> begin`, which must be the whole text."""
+        def parse():
+            header = self._header()
+            if not self._at_end():
+                raise _Spill()
+            return header
+
+        return self._run(parse)
+
+    def statements(self, last: bool) -> list:
+        """
+        Parse a run of top-level statements.
+
+        Each statement is followed by ';', except the final one of the body
+        when `last`. Raises _Spill if the text ends before that.
+        """
+        def parse():
+            block = []
+            if last:
+                block.append(self._comando())
+                while not self._at_end():
+                    if not self._mais_comandos():
+                        raise Keywords.END.wrong_token_err(self.tokens.peek())
+                    block.append(self._comando())
+            else:
+                while not self._at_end():
+                    block.append(self._comando())
+                    if not self._mais_comandos():
+                        raise Keywords.END.wrong_token_err(self.tokens.peek())
+            return block
+
+        return self._run(parse)
+
+
+class IncrementalCompiler:
+    """
+    Object code of a source, kept up to date through edits.
+
+    Compiles the same code as ObjectLexicon. Errors do not raise: they are
+    kept in `errors` until an edit fixes them, and reading `code` raises the
+    first one. Edits to the declarations re-parse only the header and patch
+    the symbol table, regenerating the statements whose variables moved.
+    Edits that change the structure of the program (across the header, the
+    body and the final 'end') compile the whole source again.
+    """
+
+    def __init__(self, text: str, filepath: str = None, tokenizer=Tokenizer):
+        self.filepath = filepath
+        self.tokenizer = tokenizer
+        self.symbols = None
+        # characters parsed by the last compilation or edit
+        self.reparsed = 0
+        self._code = None
+        self._compile(text)
+
+    @classmethod
+    def from_file(cls, filepath: str, **kwargs):
+        with open(filepath, 'rt') as f:
+            return cls(f.read(), filepath, **kwargs)
+
+    @property
+    def text(self) -> str:
+        if self._segments is None:
+            return self._text
+        return self._header + ''.join(s.text for s in self._segments) + self._trailer
+
+    @property
+    def errors(self) -> [CompilerError]:
+        if self._segments is None:
+            return [self._error]
+
+        errors = [] if self._header_error is None else [self._header_error]
+        errors += (self._segments[i].error for i in sorted(self._broken))
+        return errors
+
+    @property
+    def code(self) -> [str]:
+        """The code of the whole program, linked again after each edit (linear in its size)."""
+        errors = self.errors
+        if errors:
+            raise errors[0]
+
+        if self._code is None:
+            code = list(self._header_code)
+            for segment in self._segments:
+                base = len(code)
+                for instr in segment.code:
+                    if instr.startswith('DSV'):
+                        op, arg = instr.split(' ')
+                        instr = mkcode(op, int(arg) + base)
+                    code.append(instr)
+            code.append(mkcode('PARA', ''))
+            self._code = code
+
+        return self._code
+
+    @property
+    def program(self) -> Program:
+        """Syntax tree of the whole program, for the other backends."""
+        errors = self.errors
+        if errors:
+            raise errors[0]
+
+        body = [stmt for segment in self._segments for stmt in segment.block]
+        return Program(self._name, self.symbols, self._declarations, body, TextTape(self.text, self.filepath))
+
+    def edit(self, offset: int, removed: int, inserted: str):
+        """Replace the `removed` characters at `offset` with `inserted`."""
+        if offset < 0 or removed < 0 or offset + removed > self._size:
+            raise ValueError(f'Edição fora do texto: {offset}, {removed}')
+
+        self._code = None
+        self.reparsed = 0
+        if self._segments is None:
+            text = self._text
+            self._compile(text[:offset] + inserted + text[offset + removed:])
+            return
+
+        header = self._header
+        end = offset + removed
+        if end <= len(header) and offset < len(header):
+            self._edit_header(header[:offset] + inserted + header[end:])
+            return
+
+        rel = offset - len(header)
+        first = self._lengths.find(rel)
+        last = self._lengths.find(end - len(header) - 1) if removed else first
+        if rel < 0 or last == len(self._segments):
+            # reaches the header or the final 'end'
+            text = self.text
+            self._compile(text[:offset] + inserted + text[end:])
+            return
+
+        parts = []
+        for i in range(first, last + 1):
+            parts.append(self._segments[i].text)
+            if i != first:
+                self._set_text(i, '')
+        text = ''.join(parts)
+        rel -= self._lengths.prefix(first)
+
+        self._size += len(inserted) - removed
+        self._update(first, text[:rel] + inserted + text[rel + removed:])
+
+    def _compile(self, text: str):
+        _logger.debug('compiling %d characters', len(text))
+        self.reparsed = len(text)
+        self._size = len(text)
+        self._text = text
+        self._segments = None
+        self._error = None
+
+        lexicon = FragmentLexicon(text, self.filepath, tokenizer=self.tokenizer)
+        try:
+            name, declarations, starts, body, end = lexicon.program()
+        except _Spill:
+            self._error = CompilerSyntaxError('Fim de arquivo inesperado', len(text))
+            self._error.locate(lexicon.tape)
+            return
+        except CompilerError as err:
+            self._error = err
+            return
+
+        self.symbols = lexicon.symbols
+        self._set_header(text[:starts[0]], name, declarations)
+        self._header_error = None
+        self._trailer = text[end:]
+        self._broken = set()
+
+        starts.append(end)
+        self._segments = []
+        for i, stmt in enumerate(body):
+            segment = _Segment(text[starts[i]:starts[i + 1]])
+            self._set_block(segment, [stmt])
+            self._segments.append(segment)
+
+        self._lengths = _Fenwick([len(s.text) for s in self._segments])
+        self._lines = _Fenwick([s.text.count('\n') for s in self._segments])
+        self._body_size = end - starts[0]
+        self._text = None
+
+    def _set_header(self, text: str, name, declarations):
+        self._header = text
+        self._header_lines = text.count('\n')
+        self._name = name
+        self._declarations = declarations
+
+        compiler = ObjectCode()
+        compiler.inpp()
+        for symbol in declarations:
+            symbol.data = compiler.alme(symbol.name)
+        self._header_code = compiler.code
+
+    def _set_block(self, segment: _Segment, block: list):
+        walker = StackWalker()
+        walker.emit_block(block)
+        segment.block = block
+        segment.code = walker.compiler.code
+        segment.names = _names(block)
+        segment.error = None
+
+    def _set_text(self, i: int, text: str):
+        segment = self._segments[i]
+        self._lengths.add(i, len(text) - len(segment.text))
+        self._lines.add(i, text.count('\n') - segment.text.count('\n'))
+        self._body_size += len(text) - len(segment.text)
+        segment.text = text
+        if text == '':
+            segment.block = []
+            segment.code = []
+            segment.names = frozenset()
+            segment.error = None
+            self._broken.discard(i)
+
+    def _update(self, i: int, text: str):
+        """Set the text of segment i and parse it, with the segments after it if needed."""
+        self._set_text(i, text)
+        segment = self._segments[i]
+        while True:
+            last = self._lengths.prefix(i + 1) == self._body_size
+            if last and text[-1:].isalnum():
+                # would run into the final 'end'
+                block = None
+            else:
+                self.reparsed += len(text)
+                lexicon = FragmentLexicon(text, self.filepath, self.symbols, self.tokenizer)
+                try:
+                    block = lexicon.statements(last)
+                except _Spill:
+                    block = None
+                except CompilerError as err:
+                    segment.error = self._relocate(err, i, text)
+                    self._broken.add(i)
+                    return
+
+            if block is not None:
+                self._set_block(segment, block)
+                self._broken.discard(i)
+                return
+
+            if last:
+                self._compile(self.text)
+                return
+
+            # take in the next segment that has text
+            j = self._lengths.find(self._lengths.prefix(i + 1))
+            text += self._segments[j].text
+            self._set_text(j, '')
+            self._set_text(i, text)
+
+    def _edit_header(self, text: str):
+        self._size += len(text) - len(self._header)
+        self.reparsed = len(text)
+        if text[-1:].isalnum():
+            # would run into the first statement
+            self._compile(text + self.text[len(self._header):])
+            return
+
+        lexicon = FragmentLexicon(text, self.filepath, tokenizer=self.tokenizer)
+        try:
+            name, declarations = lexicon.header()
+        except _Spill:
+            self._compile(text + self.text[len(self._header):])
+            return
+        except CompilerError as err:
+            self._header = text
+            self._header_lines = text.count('\n')
+            self._header_error = err
+            return
+        self._header_error = None
+
+        # keep the Symbol objects of the names still declared, the trees reference them
+        old = self.symbols.symbols
+        symbols = dict()
+        for symbol in declarations:
+            kept = old.get(symbol.name, symbol)
+            kept.type = symbol.type
+            symbols[symbol.name] = kept
+        removed = old.keys() - symbols.keys()
+        addresses = {name: symbol.data for name, symbol in symbols.items()}
+
+        self.symbols.symbols = symbols
+        self._set_header(text, name, list(symbols.values()))
+        moved = {name for name, symbol in symbols.items() if symbol.data != addresses[name]}
+
+        segments = self._segments
+        for i, segment in enumerate(segments):
+            if segment.error is not None or segment.names & removed:
+                self._update(i, segment.text)
+                if self._segments is not segments:
+                    # compiled again from scratch
+                    return
+            elif segment.names & moved:
+                self._set_block(segment, segment.block)
+
+    def _relocate(self, err: CompilerError, i: int, text: str) -> CompilerError:
+        """Move an error found parsing segment i alone to its place in the source."""
+        if err.offset is None:
+            return err
+
+        start = len(self._header) + self._lengths.prefix(i)
+        line = 1 + self._header_lines + self._lines.prefix(i)
+        # the excerpt shows the whole line
+        prefix = self._line_prefix(i)
+        err.offset += start
+        return err.locate(TextTape(prefix + text, self.filepath, start - len(prefix), line))
+
+    def _line_prefix(self, i: int) -> str:
+        """Text of the line where segment i starts, before its first character."""
+        parts = []
+        for j in range(i - 1, -1, -1):
+            text = self._segments[j].text
+            newline = text.rfind('\n')
+            parts.append(text[newline + 1:])
+            if newline >= 0:
+                break
+        else:
+            parts.append(self._header[self._header.rfind('\n') + 1:])
+        return ''.join(reversed(parts))
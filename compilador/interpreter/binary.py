@@ -0,0 +1,120 @@
+"""
+Binary format for compiled object code.
+
+Layout (little endian):
+
+    header      magic 'LALG', version u16, reserved u16, instruction count u32,
+                constant count u32, operand count u32, symbol map size u32,
+                constant texts size u32
+    consts      float64 * constant count
+    ops         int32 * instruction count
+    args        int32 * instruction count
+    operands    int32 * operand count
+    symbols     utf-8 lines 'name<TAB>address'
+    texts       utf-8 lines, each constant as written in the source
+
+Sections are stored exactly as Program keeps them, so loading maps the file
+and casts each section to a memoryview without decoding any instruction.
+The constant texts are only decoded when the program is listed.
+"""
+import array
+import mmap
+import struct
+import sys
+
+from .program import Program
+
+
+MAGIC = b'LALG'
+VERSION = 2
+
+_header = struct.Struct('<4sHHIIIII')
+
+
+def _pack(typecode: str, values) -> bytes:
+    data = array.array(typecode, values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _check_size(buffer: memoryview, end: int):
+    if end > len(buffer):
+        raise ValueError('Arquivo de programa compilado truncado')
+
+
+def _section(buffer: memoryview, typecode: str, offset: int, count: int):
+    end = offset + count * array.array(typecode).itemsize
+    _check_size(buffer, end)
+    view = buffer[offset:end]
+    if sys.byteorder == 'little':
+        return view.cast(typecode), end
+
+    data = array.array(typecode, view.tobytes())
+    data.byteswap()
+    return data, end
+
+
+def dumps(program: Program) -> bytes:
+    symbols = ''.join(f'{name}\t{pos}\n' for name, pos in program.symbols.items()).encode()
+    texts = ''.join(text + '\n' for text in program.const_texts).encode()
+    return b''.join([
+        _header.pack(
+            MAGIC,
+            VERSION,
+            0,
+            len(program.ops),
+            len(program.consts),
+            len(program.operands),
+            len(symbols),
+            len(texts)),
+        _pack('d', program.consts),
+        _pack('i', program.ops),
+        _pack('i', program.args),
+        _pack('i', program.operands),
+        symbols,
+        texts,
+    ])
+
+
+def dump(program: Program, filepath: str):
+    with open(filepath, 'wb') as f:
+        f.write(dumps(program))
+
+
+def loads(buffer) -> Program:
+    buffer = memoryview(buffer)
+    if len(buffer) < _header.size:
+        raise ValueError('Arquivo de programa compilado inválido')
+
+    magic, version, _, n_ops, n_consts, n_operands, symbols_size, texts_size = _header.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError('Arquivo de programa compilado inválido')
+    if version != VERSION:
+        raise ValueError(f'Versão de programa compilado não suportada: {version}')
+
+    offset = _header.size
+    consts, offset = _section(buffer, 'd', offset, n_consts)
+    ops, offset = _section(buffer, 'i', offset, n_ops)
+    args, offset = _section(buffer, 'i', offset, n_ops)
+    operands, offset = _section(buffer, 'i', offset, n_operands)
+
+    _check_size(buffer, offset + symbols_size + texts_size)
+    symbols = dict()
+    for line in bytes(buffer[offset:offset + symbols_size]).decode().splitlines():
+        name, pos = line.split('\t')
+        symbols[name] = int(pos)
+    offset += symbols_size
+
+    texts = bytes(buffer[offset:offset + texts_size]).decode().splitlines()
+    if len(texts) != n_consts:
+        raise ValueError('Arquivo de programa compilado inválido')
+
+    return Program(ops, args, consts, operands, symbols=symbols, const_texts=texts)
+
+
+def load(filepath: str) -> Program:
+    """Map a compiled program file into memory. The map stays open while the program is referenced."""
+    with open(filepath, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads(buffer)
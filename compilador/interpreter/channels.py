@@ -0,0 +1,79 @@
+import sys
+
+
+class ConsoleInput:
+    """Reads one value per line from the terminal, showing `caret` as prompt."""
+
+    def __init__(self, caret=''):
+        self.caret = caret
+
+    def read(self):
+        return float(input(self.caret))
+
+
+class BufferedInput:
+    """
+    Reads every value up front from a file object or an iterable.
+
+    Files are read at once and split on whitespace. Items of other iterables
+    can be numbers or numeric strings.
+    """
+
+    def __init__(self, source):
+        if hasattr(source, 'read'):
+            source = source.read().split()
+        self.values = list(map(float, source))
+        self._next = iter(self.values).__next__
+
+    @classmethod
+    def from_file(cls, filepath: str):
+        with open(filepath, 'rt') as f:
+            return cls(f)
+
+    def read(self):
+        try:
+            return self._next()
+        except StopIteration:
+            raise EOFError('Fim dos dados de entrada') from None
+
+
+class ConsoleOutput:
+    """Prints each value as soon as it is written."""
+
+    def write(self, value):
+        print(value)
+
+    def flush(self):
+        pass
+
+
+class BufferedOutput:
+    """Writes values to `stream` in blocks of `buffer_size` lines."""
+
+    def __init__(self, stream=None, buffer_size=8192):
+        self.stream = sys.stdout if stream is None else stream
+        self.buffer_size = buffer_size
+        self._buffer = []
+
+    def write(self, value):
+        self._buffer.append(value)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.stream.write('\n'.join(map(str, self._buffer)))
+            self.stream.write('\n')
+            self._buffer.clear()
+        self.stream.flush()
+
+
+class ListOutput:
+    """Collects written values in `values`."""
+
+    def __init__(self):
+        self.values = []
+        self.write = self.values.append
+
+    def flush(self):
+        pass
@@ -0,0 +1,192 @@
+import operator
+
+from .program import CONST, OP, Opcode, operand_kinds, Program
+
+
+# functions applied by the superinstructions' OP operand
+functions = {
+    Opcode.SOMA: operator.add,
+    Opcode.SUBT: operator.sub,
+    Opcode.MULT: operator.mul,
+    Opcode.DIVI: operator.truediv,
+    Opcode.CPME: operator.lt,
+    Opcode.CPMA: operator.gt,
+    Opcode.CPIG: operator.eq,
+    Opcode.CDES: operator.ne,
+    Opcode.CPMI: operator.le,
+    Opcode.CMAI: operator.ge,
+}
+
+
+def resolve_args(program: Program) -> list:
+    """
+    Resolve the arguments of a program into the values the handlers use.
+
+    CRCT arguments become the constant itself and superinstructions get a
+    tuple of their operands, with OP operands resolved to functions.
+    """
+    args = list(program.args)
+    consts = program.consts
+    operands = program.operands
+    for i, op in enumerate(program.ops):
+        if op == Opcode.CRCT:
+            args[i] = consts[args[i]]
+        elif op in operand_kinds:
+            kinds = operand_kinds[op]
+            offset = args[i]
+            values = []
+            for kind, value in zip(kinds, operands[offset:offset + len(kinds)]):
+                if kind == OP:
+                    value = functions[value]
+                elif kind == CONST:
+                    value = consts[value]
+                values.append(value)
+            args[i] = tuple(values)
+    return args
+
+
+def build_table(stack: list, read, write) -> list:
+    """
+    Build the handler table used by Interpreter.run.
+
+    Handlers are closures over the data stack and I/O functions, indexed by
+    opcode. Each one receives the argument resolved by resolve_args and the
+    current instruction pointer and returns the next instruction pointer.
+    """
+    push = stack.append
+    pop = stack.pop
+
+    def nop(_, i):
+        return i + 1
+
+    def alme(n, i):
+        stack.extend([0] * n)
+        return i + 1
+
+    def crvl(n, i):
+        push(stack[n])
+        return i + 1
+
+    def crct(k, i):
+        push(k)
+        return i + 1
+
+    def armz(n, i):
+        stack[n] = pop()
+        return i + 1
+
+    def soma(_, i):
+        d = pop()
+        stack[-1] += d
+        return i + 1
+
+    def subt(_, i):
+        d = pop()
+        stack[-1] -= d
+        return i + 1
+
+    def mult(_, i):
+        d = pop()
+        stack[-1] *= d
+        return i + 1
+
+    def divi(_, i):
+        d = pop()
+        stack[-1] /= d
+        return i + 1
+
+    def inve(_, i):
+        stack[-1] *= -1
+        return i + 1
+
+    def nega(_, i):
+        stack[-1] = 0 if stack[-1] else 1
+        return i + 1
+
+    def compare(fn):
+        def handler(_, i):
+            right = pop()
+            stack[-1] = 1 if fn(stack[-1], right) else 0
+            return i + 1
+        return handler
+
+    def dsvi(p, _):
+        return p
+
+    def dsvf(p, i):
+        if pop() == 0:
+            return p
+        return i + 1
+
+    def leit(_, i):
+        push(read())
+        return i + 1
+
+    def impr(_, i):
+        write(pop())
+        return i + 1
+
+    def incr(arg, i):
+        a, k = arg
+        stack[a] += k
+        return i + 1
+
+    def arct(arg, i):
+        a, k = arg
+        stack[a] = k
+        return i + 1
+
+    def opvv(arg, i):
+        fn, a, b = arg
+        push(fn(stack[a], stack[b]))
+        return i + 1
+
+    def opvc(arg, i):
+        fn, a, k = arg
+        push(fn(stack[a], k))
+        return i + 1
+
+    def dfvv(arg, i):
+        fn, a, b, p = arg
+        if fn(stack[a], stack[b]):
+            return i + 1
+        return p
+
+    def dfvc(arg, i):
+        fn, a, k, p = arg
+        if fn(stack[a], k):
+            return i + 1
+        return p
+
+    table = [None] * len(Opcode)
+    table[Opcode.INPP] = nop
+    table[Opcode.PARA] = nop
+    table[Opcode.ALME] = alme
+    table[Opcode.CRVL] = crvl
+    table[Opcode.CRCT] = crct
+    table[Opcode.ARMZ] = armz
+    table[Opcode.SOMA] = soma
+    table[Opcode.SUBT] = subt
+    table[Opcode.MULT] = mult
+    table[Opcode.DIVI] = divi
+    table[Opcode.INVE] = inve
+    table[Opcode.CONJ] = compare(lambda d1, d2: d1 and d2)
+    table[Opcode.DISJ] = compare(lambda d1, d2: d1 or d2)
+    table[Opcode.NEGA] = nega
+    table[Opcode.CPME] = compare(operator.lt)
+    table[Opcode.CPMA] = compare(operator.gt)
+    table[Opcode.CPIG] = compare(operator.eq)
+    table[Opcode.CDES] = compare(operator.ne)
+    table[Opcode.CPMI] = compare(operator.le)
+    table[Opcode.CMAI] = compare(operator.ge)
+    table[Opcode.DSVI] = dsvi
+    table[Opcode.DSVF] = dsvf
+    table[Opcode.LEIT] = leit
+    table[Opcode.IMPR] = impr
+    table[Opcode.INCR] = incr
+    table[Opcode.ARCT] = arct
+    table[Opcode.OPVV] = opvv
+    table[Opcode.OPVC] = opvc
+    table[Opcode.DFVV] = dfvv
+    table[Opcode.DFVC] = dfvc
+    return table
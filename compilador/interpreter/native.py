@@ -0,0 +1,53 @@
+import hashlib
+import io
+
+from .channels import ConsoleInput, ConsoleOutput
+from ..codegen.PythonCode import PythonCode
+from ..lexicon.object_lexicon import ObjectLexicon
+from ..tape import TextTape
+
+
+# compiled functions by sha256 of the source text
+_cache = dict()
+
+
+def compile_file(filepath: str):
+    """
+    Compile a LALG source into a python function, reusing previous results.
+
+    :param filepath:    path to the LALG source
+    :return:            function with signature main(read, write)
+    """
+    with open(filepath, 'rb') as f:
+        source = f.read()
+    key = hashlib.sha256(source).hexdigest()
+
+    fn = _cache.get(key)
+    if fn is None:
+        compiler = PythonCode()
+        # compile the bytes that were hashed, decoded like Tape reads files
+        text = io.TextIOWrapper(io.BytesIO(source)).read()
+        ObjectLexicon(TextTape(text, filepath), compiler).parse()
+        fn = _cache[key] = compiler.build()
+    return fn
+
+
+class NativeInterpreter:
+    """Runs a program compiled by PythonCode with the same I/O as Interpreter."""
+
+    def __init__(self, fn, input_caret='', input_channel=None, output_channel=None):
+        if isinstance(fn, PythonCode):
+            fn = fn.build()
+        self.fn = fn
+        self.input_channel = ConsoleInput(input_caret) if input_channel is None else input_channel
+        self.output_channel = ConsoleOutput() if output_channel is None else output_channel
+
+    @classmethod
+    def from_file(cls, filepath: str, *args, **kwargs):
+        return cls(compile_file(filepath), *args, **kwargs)
+
+    def run(self):
+        try:
+            self.fn(self.input_channel.read, self.output_channel.write)
+        finally:
+            self.output_channel.flush()
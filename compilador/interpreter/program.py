@@ -0,0 +1,169 @@
+from enum import IntEnum
+
+from ..codegen.ObjectCode import mkcode
+
+
+class Opcode(IntEnum):
+    INPP = 0
+    PARA = 1
+    ALME = 2
+    CRVL = 3
+    CRCT = 4
+    ARMZ = 5
+    SOMA = 6
+    SUBT = 7
+    MULT = 8
+    DIVI = 9
+    INVE = 10
+    CONJ = 11
+    DISJ = 12
+    NEGA = 13
+    CPME = 14
+    CPMA = 15
+    CPIG = 16
+    CDES = 17
+    CPMI = 18
+    CMAI = 19
+    DSVI = 20
+    DSVF = 21
+    LEIT = 22
+    IMPR = 23
+    # superinstructions, see codegen.superinstructions
+    INCR = 24
+    ARCT = 25
+    OPVV = 26
+    OPVC = 27
+    DFVV = 28
+    DFVC = 29
+
+
+# opcodes whose argument is an integer (address, jump target or count)
+int_args = frozenset({
+    Opcode.ALME,
+    Opcode.CRVL,
+    Opcode.ARMZ,
+    Opcode.DSVI,
+    Opcode.DSVF,
+})
+
+# operand layout of the instructions that take more than one argument
+OP, ADDR, CONST, TARGET = range(4)
+operand_kinds = {
+    Opcode.INCR: (ADDR, CONST),
+    Opcode.ARCT: (ADDR, CONST),
+    Opcode.OPVV: (OP, ADDR, ADDR),
+    Opcode.OPVC: (OP, ADDR, CONST),
+    Opcode.DFVV: (OP, ADDR, ADDR, TARGET),
+    Opcode.DFVC: (OP, ADDR, CONST, TARGET),
+}
+
+
+def decode(instruction: str):
+    """
+    Split a textual instruction into its opcode and raw argument.
+
+    :param instruction: instruction as emitted by ObjectCode, e.g. 'CRVL 0'
+    :return:            tuple (Opcode, str)
+    """
+    op, _, arg = instruction.partition(' ')
+    try:
+        return Opcode[op.upper()], arg.strip()
+    except KeyError:
+        raise ValueError(f'Instrução desconhecida: {instruction!r}') from None
+
+
+class Program:
+    """
+    Pre-decoded object code.
+
+    Each instruction is stored as an integer opcode in `ops` and an integer
+    argument in `args`. For CRCT the argument is an index into `consts`.
+    Superinstructions store the offset of their operands in `operands`,
+    laid out as described by `operand_kinds`. `symbols` maps variable names
+    to their addresses. `const_texts` keeps each constant as it was written,
+    so the listing gives back the code the program was assembled from.
+    """
+
+    def __init__(self, ops, args, consts, operands=None, listing=None, symbols=None, const_texts=None):
+        self.ops = ops
+        self.args = args
+        self.consts = consts
+        self.const_texts = [str(value) for value in consts] if const_texts is None else const_texts
+        self.operands = [] if operands is None else operands
+        self._listing = listing
+        self.symbols = dict() if symbols is None else symbols
+
+    def __len__(self):
+        return len(self.ops)
+
+    @property
+    def listing(self) -> [str]:
+        if self._listing is None:
+            self._listing = [self.disassemble(i) for i in range(len(self))]
+        return self._listing
+
+    def disassemble(self, i) -> str:
+        op = Opcode(self.ops[i])
+        arg = self.args[i]
+        if op == Opcode.CRCT:
+            arg = self.const_texts[arg]
+        elif op in operand_kinds:
+            kinds = operand_kinds[op]
+            values = []
+            for kind, value in zip(kinds, self.operands[arg:arg + len(kinds)]):
+                if kind == OP:
+                    value = Opcode(value).name
+                elif kind == CONST:
+                    value = self.const_texts[value]
+                values.append(str(value))
+            arg = ' '.join(values)
+        elif op not in int_args:
+            arg = ''
+        return mkcode(op.name, arg)
+
+    @classmethod
+    def assemble(cls, code: [str], symbols: dict = None) -> 'Program':
+        ops = []
+        args = []
+        consts = []
+        const_texts = []
+        operands = []
+        pool = dict()
+
+        def const(text):
+            # keyed by the text, so 0 and 0.0 (or 0.0 and -0.0) get separate
+            # entries and are listed as written
+            index = pool.get(text)
+            if index is None:
+                index = pool[text] = len(consts)
+                consts.append(float(text))
+                const_texts.append(text)
+            return index
+
+        for instruction in code:
+            op, arg = decode(instruction)
+            if op == Opcode.CRCT:
+                arg = const(arg)
+            elif op in int_args:
+                arg = int(arg)
+            elif op in operand_kinds:
+                kinds = operand_kinds[op]
+                values = arg.split()
+                if len(values) != len(kinds):
+                    raise ValueError(f'Número inválido de operandos: {instruction!r}')
+
+                arg = len(operands)
+                for kind, value in zip(kinds, values):
+                    if kind == OP:
+                        operands.append(int(decode(value)[0]))
+                    elif kind == CONST:
+                        operands.append(const(value))
+                    else:
+                        operands.append(int(value))
+            else:
+                arg = 0
+
+            ops.append(int(op))
+            args.append(arg)
+
+        return cls(ops, args, consts, operands, list(code), symbols, const_texts)
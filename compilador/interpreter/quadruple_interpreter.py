@@ -0,0 +1,189 @@
+import operator
+
+from .channels import ConsoleInput, ConsoleOutput
+
+
+# quadruple operations, in handler table order
+operations = (
+    'ALME', 'PARA', 'read', 'write', 'goto', 'JF', 'uminus', ':=',
+    '+', '-', '*', '/', '=', '<>', '>=', '<=', '>', '<',
+)
+opcodes = {op: i for i, op in enumerate(operations)}
+
+arithmetic = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+relational = {
+    '=': operator.eq,
+    '<>': operator.ne,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+
+def is_number(arg: str):
+    return arg[:1].isdigit()
+
+
+class QuadrupleProgram:
+    """
+    Pre-decoded IntermediateCode.
+
+    Every name and constant gets a slot in the frame, so each instruction is
+    a tuple (opcode, a, b, r) of slot indices. Constants are preloaded into
+    their slots by `make_frame`. Jump targets are stored as plain integers.
+    """
+
+    def __init__(self, instructions, slots, consts, listing=None):
+        self.instructions = instructions
+        self.slots = slots
+        self.consts = consts
+        self.listing = listing
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def make_frame(self) -> list:
+        frame = [0] * len(self.slots)
+        for slot, value in self.consts.items():
+            frame[slot] = value
+        return frame
+
+    @classmethod
+    def assemble(cls, code: [str]) -> 'QuadrupleProgram':
+        slots = dict()
+        consts = dict()
+
+        def slot(arg):
+            if not arg:
+                return 0
+            if arg not in slots:
+                slots[arg] = len(slots)
+                if is_number(arg):
+                    consts[slots[arg]] = float(arg)
+            return slots[arg]
+
+        instructions = []
+        for quad in code:
+            op, arg1, arg2, res = quad.split(';')
+            if op not in opcodes:
+                raise ValueError(f'Instrução desconhecida: {quad!r}')
+
+            if op == 'goto':
+                args = (int(arg1), 0, 0)
+            elif op == 'JF':
+                args = (slot(arg1), int(arg2), 0)
+            elif op == 'ALME':
+                args = (0, 0, slot(res))
+            else:
+                args = (slot(arg1), slot(arg2), slot(res))
+            instructions.append((opcodes[op],) + args)
+
+        return cls(instructions, slots, consts, list(code))
+
+
+def build_table(frame: list, read, write) -> list:
+    """
+    Build the handler table used by QuadrupleInterpreter.run.
+
+    Handlers receive the three operands of the quadruple and the current
+    instruction pointer and return the next instruction pointer.
+    """
+
+    def alme(a, b, r, i):
+        # same initial value the stack machine gives to ALME
+        frame[r] = 0
+        return i + 1
+
+    def nop(a, b, r, i):
+        return i + 1
+
+    def read_(a, b, r, i):
+        frame[r] = read()
+        return i + 1
+
+    def write_(a, b, r, i):
+        write(frame[a])
+        return i + 1
+
+    def goto(a, b, r, i):
+        return a
+
+    def jf(a, b, r, i):
+        if frame[a] == 0:
+            return b
+        return i + 1
+
+    def uminus(a, b, r, i):
+        frame[r] = frame[a] * -1
+        return i + 1
+
+    def assign(a, b, r, i):
+        frame[r] = frame[a]
+        return i + 1
+
+    def binary(fn):
+        def handler(a, b, r, i):
+            frame[r] = fn(frame[a], frame[b])
+            return i + 1
+        return handler
+
+    def compare(fn):
+        def handler(a, b, r, i):
+            frame[r] = 1 if fn(frame[a], frame[b]) else 0
+            return i + 1
+        return handler
+
+    handlers = {
+        'ALME': alme,
+        'PARA': nop,
+        'read': read_,
+        'write': write_,
+        'goto': goto,
+        'JF': jf,
+        'uminus': uminus,
+        ':=': assign,
+    }
+    handlers.update((op, binary(fn)) for op, fn in arithmetic.items())
+    handlers.update((op, compare(fn)) for op, fn in relational.items())
+    return [handlers[op] for op in operations]
+
+
+class QuadrupleInterpreter:
+    """Register-style VM executing IntermediateCode quadruples over a frame of named slots."""
+
+    def __init__(self, code, input_caret='', input_channel=None, output_channel=None):
+        if not isinstance(code, QuadrupleProgram):
+            code = QuadrupleProgram.assemble(code)
+        self.program = code
+        self.frame = code.make_frame()
+        self.i = 0
+        self.input_channel = ConsoleInput(input_caret) if input_channel is None else input_channel
+        self.output_channel = ConsoleOutput() if output_channel is None else output_channel
+
+    @property
+    def code(self) -> [str]:
+        return self.program.listing
+
+    def get(self, name: str):
+        return self.frame[self.program.slots[name]]
+
+    def run(self):
+        code = self.program.instructions
+        table = build_table(self.frame, self.input_channel.read, self.output_channel.write)
+
+        i = self.i
+        end = len(code)
+        try:
+            while i < end:
+                op, a, b, r = code[i]
+                i = table[op](a, b, r, i)
+        finally:
+            self.i = i
+            self.output_channel.flush()
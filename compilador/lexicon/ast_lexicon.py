@@ -0,0 +1,405 @@
+from .expressions import BinOp, Const, Neg, Var
+from .helpers import has_token, validate_ident, validate_symbol
+from .keywords import Keywords
+from .syntax import Assign, If, Program, Read, While, Write
+from ..errors import CompilerError, CompilerSemanticError, CompilerSyntaxError
+from ..symbols_table import SymbolsTable
+from ..tape import Tape
+from ..token import IDENTIFICADOR, Token, TokenType
+from ..token_stream import TokenStream
+from ..tokenizer import Tokenizer
+
+
+class AstLexicon:
+    """
+    Parse a program once into a syntax tree shared by every backend.
+
+    Declarations are checked while parsing, so the tree only references
+    symbols of `symbols`. Expressions are kept as written: folding and type
+    checks belong to the backends, see compilador.codegen.walkers.
+    """
+
+    def __init__(self, filepath: str, tokenizer=Tokenizer):
+        self.tape = filepath if isinstance(filepath, Tape) else Tape(filepath)
+        self.tokenizer = tokenizer(self.tape)
+        self.tokens = TokenStream(self.tokenizer)
+        self.symbols = SymbolsTable()
+
+    def parse(self) -> Program:
+        try:
+            program = self._programa()
+            try:
+                token = self._next_token()
+            except EOFError:
+                pass
+            else:
+                raise CompilerSyntaxError.simples('EOF', token)
+        except EOFError:
+            # the source ended in the middle of the program, or of a comment
+            raise CompilerSyntaxError('Fim de arquivo inesperado', self.tape.pos).locate(self.tape) from None
+        except CompilerError as err:
+            # errors without a position point at the last token read
+            last = self.tokens.last
+            raise err.locate(self.tape, last and last.start)
+
+        return program
+
+    def validate_var(self, var):
+        if not self.symbols.has(var):
+            offset = var.start if isinstance(var, Token) else None
+            raise CompilerSemanticError(f'Variável {var!r} não foi declarada.', offset)
+
+    def _next_token(self) -> Token:
+        return self.tokens.next()
+
+    def _get_ident(self) -> Token:
+        token = self._next_token()
+        validate_ident(token)
+        return token
+
+    def _get_var(self) -> Var:
+        token = self._get_ident()
+        self.validate_var(token)
+        return Var(self.symbols.get(token), token)
+
+    def _programa(self) -> Program:
+        """
+        Implementa <programa>
+
+        <programa>  ->  program ident <corpo> .
+        """
+        token = self._next_token()
+        if not token == Keywords.PROGRAM.value:
+            raise Keywords.PROGRAM.wrong_token_err(token)
+
+        name = self._get_ident()
+        declarations, body = self._corpo()
+
+        token = self._next_token()
+        validate_symbol(token, '.')
+
+        return Program(name, self.symbols, declarations, body, self.tape)
+
+    def _corpo(self):
+        """
+        Implementa <corpo>
+
+        <corpo>  ->  <dc> begin <comandos> end
+        """
+        declarations = self._dc()
+
+        token = self._next_token()
+        if not token == Keywords.BEGIN:
+            raise Keywords.BEGIN.wrong_token_err(token)
+
+        body = self._comandos()
+
+        token = self._next_token()
+        if not token == Keywords.END:
+            raise Keywords.END.wrong_token_err(token)
+
+        return declarations, body
+
+    def _dc(self) -> list:
+        """
+        Implementa <dc>
+
+        <dc>  ->  <dc_v> <mais_dc> | λ
+
+        The <dc> after each <mais_dc> is parsed by the loop, not recursively.
+        """
+        declarations = []
+        while True:
+            token = self.tokens.peek()
+            if not (token == Keywords.REAL or token == Keywords.INTEGER):
+                return declarations
+
+            self._dc_v(declarations)
+            if not self._mais_dc():
+                return declarations
+
+    def _mais_dc(self) -> bool:
+        """
+        Implementa <mais_dc>
+
+        <mais_dc>  ->  ; <dc> | λ
+
+        Only consumes the ';', returns whether a <dc> follows.
+        """
+        return self.tokens.accept(Token.simbolo(';'))
+
+    def _dc_v(self, declarations: list):
+        """
+        Implementa <dc_v>
+
+        <dc_v>  ->  <tipo_var> : <variaveis>
+        """
+        tipo = self._tipo_var()
+
+        token = self._next_token()
+        validate_symbol(token, ':')
+
+        self._variaveis(tipo, declarations)
+
+    def _tipo_var(self) -> TokenType:
+        """
+        Implementa <tipo_var>
+
+        <tipo_var>  ->  real | integer
+        """
+        token = self._next_token()
+        if token == Keywords.REAL:
+            return TokenType.REAL
+        elif token == Keywords.INTEGER:
+            return TokenType.INTEIRO
+        else:
+            raise CompilerSyntaxError.simples(
+                f'{Keywords.REAL.value} ou {Keywords.INTEGER.value}',
+                token)
+
+    def _variaveis(self, tipo: TokenType, declarations: list):
+        """
+        Implementa <variaveis>
+
+        <variaveis>  ->  ident <mais_var>
+
+        The <variaveis> after each <mais_var> is parsed by the loop, not recursively.
+        """
+        while True:
+            id_ = self._get_ident()
+            declarations.append(self.symbols.add(id_, tipo))
+
+            if not self._mais_var():
+                return
+
+    def _mais_var(self) -> bool:
+        """
+        Implementa <mais_var>
+
+        <mais_var>  ->  , <variaveis> | λ
+
+        Only consumes the ',', returns whether <variaveis> follows.
+        """
+        return self.tokens.accept(Token.simbolo(','))
+
+    def _comandos(self) -> list:
+        """
+        Implementa <comandos>
+
+        <comandos>  ->  <comando> <mais_comandos>
+
+        The <comandos> after each <mais_comandos> is parsed by the loop, not
+        recursively, so the length of a block does not grow the call stack.
+        """
+        block = []
+        while True:
+            block.append(self._comando())
+            if not self._mais_comandos():
+                return block
+
+    def _mais_comandos(self) -> bool:
+        """
+        Implementa <mais_comandos>
+
+        <mais_comandos>  ->  ; <comandos> | λ
+
+        Only consumes the ';', returns whether <comandos> follows.
+        """
+        return self.tokens.accept(Token.simbolo(';'))
+
+    def _comando(self):
+        """
+        Implementa <comando>
+
+        <comando>  ->  read (ident)
+                   |   write (ident)
+                   |   ident := <expressao>
+                   |   if <condicao> then <comandos> <pfalsa> $
+                   |   while <condicao> do <comandos> $
+        """
+        token = self._next_token()
+        if token == Keywords.READ or token == Keywords.WRITE:
+            fn = token
+
+            token = self._next_token()
+            validate_symbol(token, '(')
+
+            var = self._get_var()
+
+            token = self._next_token()
+            validate_symbol(token, ')')
+
+            return Read(var) if fn == Keywords.READ else Write(var)
+        elif token == Keywords.IF:
+            cond = self._condicao()
+
+            token = self._next_token()
+            if not token == Keywords.THEN:
+                raise Keywords.THEN.wrong_token_err(token)
+
+            then = self._comandos()
+            else_ = self._pfalsa()
+
+            token = self._next_token()
+            validate_symbol(token, '$')
+            return If(cond, then, else_)
+        elif token == Keywords.WHILE:
+            cond = self._condicao()
+
+            token = self._next_token()
+            if not token == Keywords.DO:
+                raise Keywords.DO.wrong_token_err(token)
+
+            body = self._comandos()
+
+            token = self._next_token()
+            validate_symbol(token, '$')
+            return While(cond, body)
+        else:
+            # assign
+            validate_ident(token)
+            self.validate_var(token)
+            target = Var(self.symbols.get(token), token)
+
+            validate_symbol(self._next_token(), ':=')
+
+            return Assign(target, self._expressao())
+
+    def _condicao(self) -> BinOp:
+        """
+        Implementa <condicao>
+
+        <condicao>  ->  <expressao> <relacao> <expressao>
+        """
+        arg1 = self._expressao()
+        op = self._relacao()
+        arg2 = self._expressao()
+
+        return BinOp(op, arg1, arg2)
+
+    def _relacao(self) -> str:
+        """
+        Implementa <relacao>
+
+        <relacao>  ->  = | <> | >= | <= | > | <
+        """
+        token = self._next_token()
+        comps = {'=', '<>', '>=', '<=', '>', '<'}
+        has_token(comps, token, True)
+        return token.valor
+
+    def _expressao(self):
+        """
+        Implementa <expressao>
+
+        <expressao>  ->  <termo> <outros_termos>
+        """
+        termo = self._termo()
+        return self._outros_termos(termo)
+
+    def _termo(self):
+        """
+        Implementa <termo>
+
+        <termo>  ->  <op_un> <fator> <mais_fatores>
+        """
+        signal = self._op_un()
+        fator = self._fator()
+
+        if signal == '-':
+            fator = Neg(fator)
+
+        return self._mais_fatores(fator)
+
+    def _op_un(self):
+        """
+        Implementa <op_un>
+
+        <op_un>  ->  - | λ
+        """
+        if self.tokens.accept(Token.simbolo('-')):
+            return '-'
+        return None
+
+    def _fator(self):
+        """
+        Implementa <fator>
+
+        <fator>  ->  ident
+                 |   numero_int
+                 |   numero_real
+                 |   (<expressao>)
+        """
+        token = self._next_token()
+
+        if token.tipo == IDENTIFICADOR:
+            validate_ident(token)
+            self.validate_var(token)
+            return Var(self.symbols.get(token), token)
+
+        elif token == Token.simbolo('('):
+            res = self._expressao()
+            validate_symbol(self._next_token(), ')')
+            return res
+
+        elif token.is_number:
+            return Const(float(token.valor), token.valor, token)
+
+        else:
+            raise CompilerSyntaxError.invalid_token(token)
+
+    def _outros_termos(self, termo):
+        """
+        Implementa <outros_termos>
+
+        <outros_termos>  ->  <op_ad> <termo> <outros_termos> | λ
+        """
+        return self.__math('+-', termo, self._op_ad, self._termo)
+
+    def _op_ad(self) -> str:
+        """
+        Implementa <op_ad>
+
+        <op_ad>  ->  + | -
+        """
+        token = self._next_token()
+        has_token('+-', token, True)
+        return token.valor
+
+    def _mais_fatores(self, fator):
+        """
+        Implementa <mais_fatores>
+
+        <mais_fatores>  ->  <op_mul> <fator> <mais_fatores>
+        """
+        return self.__math('*/', fator, self._op_mul, self._fator)
+
+    def _op_mul(self) -> str:
+        """
+        Implementa <op_mul>
+
+        <op_mul>  ->  * | /
+        """
+        token = self._next_token()
+        has_token('*/', token, True)
+        return token.valor
+
+    def _pfalsa(self):
+        """
+        Implementa <pfalsa>
+
+        <pfalsa>  ->  else <comandos> | λ
+        """
+        if self.tokens.accept(Keywords.ELSE):
+            return self._comandos()
+        return None
+
+    def __math(self, symbols: iter, esq, fn_op, fn_dir):
+        while True:
+            if not has_token(symbols, self.tokens.peek()):
+                return esq
+
+            op = fn_op()
+            dir_ = fn_dir()
+
+            esq = BinOp(op, esq, dir_)
@@ -0,0 +1,164 @@
+import math
+import operator
+
+from ..symbols_table import Symbol
+
+
+operations = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '=': lambda a, b: 1.0 if a == b else 0.0,
+    '<>': lambda a, b: 1.0 if a != b else 0.0,
+    '>=': lambda a, b: 1.0 if a >= b else 0.0,
+    '<=': lambda a, b: 1.0 if a <= b else 0.0,
+    '>': lambda a, b: 1.0 if a > b else 0.0,
+    '<': lambda a, b: 1.0 if a < b else 0.0,
+}
+
+
+class Const:
+    # `token` is the source token of literals, None for folded values
+    __slots__ = ('value', 'text', 'token')
+
+    def __init__(self, value: float, text: str = None, token=None):
+        self.value = value
+        self.text = repr(value) if text is None else text
+        self.token = token
+
+    def __repr__(self):
+        return f'Const<{self.text}>'
+
+    def is_(self, value):
+        return self.value == value
+
+
+class Var:
+    __slots__ = ('symbol', 'token')
+
+    def __init__(self, symbol: Symbol, token=None):
+        self.symbol = symbol
+        self.token = token
+
+    def __repr__(self):
+        return f'Var<{self.symbol.name}>'
+
+
+# results that are reals whatever the operands are
+real_ops = frozenset({'/', '=', '<>', '>=', '<=', '>', '<'})
+
+
+def is_real(expr) -> bool:
+    """
+    Whether `expr` is known to evaluate to a real.
+
+    A variable never assigned holds the integer 0 left by ALME, so only
+    constants, and operations with a real operand or a real result, are.
+    """
+    return isinstance(expr, Const) or getattr(expr, 'real', False)
+
+
+class BinOp:
+    __slots__ = ('op', 'left', 'right', 'real')
+
+    def __init__(self, op: str, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.real = op in real_ops or is_real(left) or is_real(right)
+
+    def __repr__(self):
+        return f'BinOp<{self.left!r} {self.op} {self.right!r}>'
+
+
+class Neg:
+    __slots__ = ('operand', 'real')
+
+    def __init__(self, operand):
+        self.operand = operand
+        self.real = is_real(operand)
+
+    def __repr__(self):
+        return f'Neg<{self.operand!r}>'
+
+
+def negate(expr):
+    """Build -expr, folding constants and double negations."""
+    if isinstance(expr, Const):
+        return Const(expr.value * -1)
+    if isinstance(expr, Neg):
+        return expr.operand
+    return Neg(expr)
+
+
+def binop(op: str, left, right):
+    """
+    Build `left op right`, folding constant operands and the identities
+    x*1, 1*x, x/1, x+(-0.0) and x-0.0.
+
+    Division by a constant zero is kept so the error happens at run time.
+    The identities are only folded when x is known to be a real: the
+    arithmetic turns the integer 0 of a variable never assigned into 0.0.
+    x+0.0, x-(-0.0) and 0+x are not folded, they give 0.0 for x = -0.0.
+    """
+    left_const = isinstance(left, Const)
+    right_const = isinstance(right, Const)
+
+    if left_const and right_const and not (op == '/' and right.value == 0):
+        return Const(operations[op](left.value, right.value))
+
+    if right_const and is_real(left):
+        if op in '*/' and right.is_(1):
+            return left
+        if op in '+-' and right.is_(0) and math.copysign(1.0, right.value) == (-1.0 if op == '+' else 1.0):
+            return left
+    if left_const and is_real(right):
+        if op == '*' and left.is_(1):
+            return right
+
+    return BinOp(op, left, right)
+
+
+# marks a pending operation while walking a tree
+_UMINUS = object()
+
+
+def fold(expr):
+    """Rebuild an unfolded tree with `binop` and `negate`, as the parsers fold while parsing."""
+    # explicit stack: long operator chains build very deep trees
+    pending = [expr]
+    values = []
+    while pending:
+        node = pending.pop()
+        if node is _UMINUS:
+            values.append(negate(values.pop()))
+        elif isinstance(node, str):
+            right = values.pop()
+            values.append(binop(node, values.pop(), right))
+        elif isinstance(node, BinOp):
+            pending.extend((node.op, node.right, node.left))
+        elif isinstance(node, Neg):
+            pending.extend((_UMINUS, node.operand))
+        else:
+            values.append(node)
+    return values.pop()
+
+
+def emit(compiler, expr):
+    """Emit the stack code of an expression through an ObjectCode-like compiler."""
+    pending = [expr]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, str):
+            compiler.op(node)
+        elif node is _UMINUS:
+            compiler.uminus()
+        elif isinstance(node, BinOp):
+            pending.extend((node.op, node.right, node.left))
+        elif isinstance(node, Neg):
+            pending.extend((_UMINUS, node.operand))
+        elif isinstance(node, Var):
+            compiler.stack(node.symbol)
+        else:
+            compiler.stack(node.text)
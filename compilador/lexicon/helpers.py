@@ -1,19 +1,20 @@
-from .keywords import Keywords
+from .keywords import reserved
 from ..errors import CompilerSyntaxError
-from ..token import Token, TokenType
+from ..token import IDENTIFICADOR, SIMBOLO, Token
 
 
 def validate_ident(token: Token):
-    if not token.tipo == TokenType.IDENTIFICADOR:
+    if token.tipo != IDENTIFICADOR:
         raise CompilerSyntaxError.simples('identificador', token)
 
-    if any(token == kw.value for kw in Keywords):
+    if token.valor in reserved:
         raise CompilerSyntaxError(
-            f'Palavra reservada não pode ser usada como identificador: {token}')
+            f'Palavra reservada não pode ser usada como identificador: {token}',
+            token.start)
 
 
 def validate_symbol(token: Token, symbol: str):
-    if not token == Token.simbolo(symbol):
+    if token.tipo != SIMBOLO or token.valor != symbol:
         raise CompilerSyntaxError.simples(repr(symbol), token)
 
 
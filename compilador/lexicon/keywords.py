@@ -20,3 +20,7 @@ class Keywords(Enum):
 
     def wrong_token_err(self, token: Token):
         return CompilerSyntaxError.simples(self.value, token)
+
+
+# keyword by name, for classifying identifiers with a single lookup
+reserved = {kw.value.valor: kw for kw in Keywords}
@@ -0,0 +1,78 @@
+"""
+Statement nodes of the syntax tree built by AstLexicon.
+
+Expressions use the nodes of expressions.py, unfolded: literals and
+variables keep their source token. Blocks are plain lists of statements.
+"""
+from ..symbols_table import Symbol, SymbolsTable
+from ..token import Token
+
+
+class Program:
+    __slots__ = ('name', 'symbols', 'declarations', 'body', 'tape')
+
+    def __init__(self, name: Token, symbols: SymbolsTable, declarations: [Symbol], body: list, tape=None):
+        self.name = name
+        self.symbols = symbols
+        self.declarations = declarations
+        self.body = body
+        # kept to locate errors found by the backends
+        self.tape = tape
+
+    def __repr__(self):
+        return f'Program<{self.name.valor}, {len(self.declarations)} variables, {len(self.body)} statements>'
+
+
+class Read:
+    __slots__ = ('target',)
+
+    def __init__(self, target):
+        self.target = target
+
+    def __repr__(self):
+        return f'Read<{self.target!r}>'
+
+
+class Write:
+    __slots__ = ('source',)
+
+    def __init__(self, source):
+        self.source = source
+
+    def __repr__(self):
+        return f'Write<{self.source!r}>'
+
+
+class Assign:
+    __slots__ = ('target', 'expr')
+
+    def __init__(self, target, expr):
+        self.target = target
+        self.expr = expr
+
+    def __repr__(self):
+        return f'Assign<{self.target!r} := {self.expr!r}>'
+
+
+class If:
+    # `else_` is None without an else
+    __slots__ = ('cond', 'then', 'else_')
+
+    def __init__(self, cond, then: list, else_: list = None):
+        self.cond = cond
+        self.then = then
+        self.else_ = else_
+
+    def __repr__(self):
+        return f'If<{self.cond!r}>'
+
+
+class While:
+    __slots__ = ('cond', 'body')
+
+    def __init__(self, cond, body: list):
+        self.cond = cond
+        self.body = body
+
+    def __repr__(self):
+        return f'While<{self.cond!r}>'
@@ -0,0 +1,232 @@
+import functools
+
+from .ast_lexicon import AstLexicon
+from .expressions import BinOp, Const, Neg, Var
+from .helpers import validate_ident
+from .keywords import Keywords, reserved
+from .syntax import Assign, If, Program, Read, While, Write
+from ..errors import CompilerSyntaxError
+from ..grammar import EOF, GRAMMAR_PATH, is_action, is_nonterminal, load_table
+from ..token import IDENTIFICADOR, INTEIRO, SIMBOLO, Token, TokenType
+
+
+# the productions of dados/lalg.txt that have semantic actions. Without the
+# actions each one must be exactly a production of that grammar
+actions_grammar = '''
+<programa>      ->  program ident #program <corpo> .
+
+<dc_v>          ->  <tipo_var> : <variaveis> #drop
+
+<tipo_var>      ->  real #tipo
+                |   integer #tipo
+
+<variaveis>     ->  ident #declare <mais_var>
+
+<comando>       ->  read ( ident #read )
+                |   write ( ident #write )
+                |   ident #target := <expressao> #assign
+                |   if <condicao> then #if <comandos> <pfalsa> #close $
+                |   while <condicao> do #while <comandos> #close $
+
+<condicao>      ->  <expressao> <relacao> #op <expressao> #binop
+
+<termo>         ->  <op_un> <fator> #sign <mais_fatores>
+
+<op_un>         ->  - #minus
+                |   λ #plus
+
+<fator>         ->  ident #var
+                |   numero_int #const
+                |   numero_real #const
+
+<outros_termos> ->  <op_ad> #op <termo> #binop <outros_termos>
+
+<mais_fatores>  ->  <op_mul> #op <fator> #binop <mais_fatores>
+
+<pfalsa>        ->  else #else <comandos>
+'''
+
+_descriptions = {
+    'ident': 'identificador',
+    'numero_int': 'número inteiro',
+    'numero_real': 'número real',
+    EOF: 'EOF',
+}
+
+
+def describe(terminal: str) -> str:
+    return _descriptions.get(terminal) or repr(terminal)
+
+
+def terminal(token: Token) -> str:
+    """Grammar terminal matched by a token."""
+    tipo = token.tipo
+    if tipo == IDENTIFICADOR:
+        valor = token.valor
+        return valor if valor in reserved else 'ident'
+    if tipo == SIMBOLO:
+        return token.valor
+    return 'numero_int' if tipo == INTEIRO else 'numero_real'
+
+
+@functools.lru_cache()
+def load_grammar(filepath: str = GRAMMAR_PATH):
+    """The grammar in `filepath` with `actions_grammar` applied, and its LL(1) table."""
+    grammar, table = load_table(filepath)
+    return grammar.annotate(actions_grammar), table
+
+
+class TableLexicon(AstLexicon):
+    """
+    AstLexicon driven by the LL(1) table of dados/lalg.txt.
+
+    The parse is a loop over an explicit stack of grammar symbols instead of
+    one method call per production. Actions (`#name` in `actions_grammar`)
+    call `_on_name`, building the same syntax tree as AstLexicon, so every
+    backend can compile from it. Extending the language takes a change to
+    the grammar and its actions, the walkers are shared.
+    """
+
+    def __init__(self, *args, grammar: str = GRAMMAR_PATH, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.grammar, table = load_grammar(grammar)
+        # values of the semantic actions: types, operators and expressions
+        self.values = []
+        # statement lists being filled, the innermost last
+        self.blocks = []
+        self.declarations = []
+        self.name = None
+
+        ids = {nt: i for i, nt in enumerate(self.grammar.nonterminals)}
+
+        def entry(symbol):
+            if is_nonterminal(symbol):
+                return ids[symbol]
+            if is_action(symbol):
+                return getattr(self, '_on_' + symbol[1:])
+            return symbol
+
+        # right hand sides reversed, ready to be pushed on the stack
+        productions = [tuple(map(entry, reversed(rhs))) for _, rhs in self.grammar.productions]
+        self._rows = [
+            {t: productions[i] for t, i in table[nt].items()}
+            for nt in self.grammar.nonterminals]
+        self._start = ids[self.grammar.start]
+        self._names = self.grammar.nonterminals
+
+    def _lookahead(self):
+        try:
+            token = self.tokens.peek()
+        except EOFError:
+            return None, EOF
+        return token, terminal(token)
+
+    def _programa(self) -> Program:
+        rows = self._rows
+        stack = [EOF, self._start]
+        pop = stack.pop
+        push = stack.extend
+
+        token, term = self._lookahead()
+        while stack:
+            top = pop()
+            kind = type(top)
+            if kind is int:
+                rhs = rows[top].get(term)
+                if rhs is None:
+                    if 'ident' in rows[top] and token is not None and token.tipo == IDENTIFICADOR:
+                        validate_ident(token)
+                    expected = ' ou '.join(map(describe, sorted(rows[top])))
+                    raise CompilerSyntaxError.simples(expected, token or 'EOF')
+                push(rhs)
+            elif kind is str:
+                if top != term:
+                    if top == 'ident' and token is not None and token.tipo == IDENTIFICADOR:
+                        validate_ident(token)
+                    raise CompilerSyntaxError.simples(describe(top), token or 'EOF')
+                if term is EOF:
+                    break
+                self._next_token()
+                token, term = self._lookahead()
+            else:
+                top()
+
+        return Program(self.name, self.symbols, self.declarations, self.blocks.pop(), self.tape)
+
+    def _var(self) -> Var:
+        token = self.tokens.last
+        self.validate_var(token)
+        return Var(self.symbols.get(token), token)
+
+    def _on_program(self):
+        self.name = self.tokens.last
+        self.blocks.append([])
+
+    def _on_tipo(self):
+        self.values.append(TokenType.REAL if self.tokens.last == Keywords.REAL else TokenType.INTEIRO)
+
+    def _on_drop(self):
+        self.values.pop()
+
+    def _on_declare(self):
+        # the type stays on the stack for the next names of the list
+        self.declarations.append(self.symbols.add(self.tokens.last, self.values[-1]))
+
+    def _on_read(self):
+        self.blocks[-1].append(Read(self._var()))
+
+    def _on_write(self):
+        self.blocks[-1].append(Write(self._var()))
+
+    def _on_target(self):
+        self.values.append(self._var())
+
+    def _on_assign(self):
+        expr = self.values.pop()
+        self.blocks[-1].append(Assign(self.values.pop(), expr))
+
+    def _on_if(self):
+        stmt = If(self.values.pop(), [])
+        self.blocks[-1].append(stmt)
+        self.blocks.append(stmt.then)
+
+    def _on_else(self):
+        self.blocks.pop()
+        # the if is the last statement of the enclosing block
+        stmt = self.blocks[-1][-1]
+        stmt.else_ = []
+        self.blocks.append(stmt.else_)
+
+    def _on_while(self):
+        stmt = While(self.values.pop(), [])
+        self.blocks[-1].append(stmt)
+        self.blocks.append(stmt.body)
+
+    def _on_close(self):
+        self.blocks.pop()
+
+    def _on_op(self):
+        self.values.append(self.tokens.last.valor)
+
+    def _on_binop(self):
+        values = self.values
+        right = values.pop()
+        op = values.pop()
+        values[-1] = BinOp(op, values[-1], right)
+
+    def _on_minus(self):
+        self.values.append(True)
+
+    def _on_plus(self):
+        self.values.append(False)
+
+    def _on_sign(self):
+        fator = self.values.pop()
+        self.values[-1] = Neg(fator) if self.values[-1] else fator
+
+    def _on_var(self):
+        self.values.append(self._var())
+
+    def _on_const(self):
+        token = self.tokens.last
+        self.values.append(Const(float(token.valor), token.valor, token))
@@ -0,0 +1,50 @@
+from .ast_lexicon import AstLexicon
+from ..metrics import CompileMetrics, phase
+from ..tokenizer import Tokenizer
+
+
+class TreeLexicon:
+    """
+    Compiles a program through its syntax tree: `parser` (AstLexicon, or
+    another parser building the same tree such as TableLexicon) parses it
+    once and `walker` generates the code.
+
+    Base of ObjectLexicon and Lexicon, so the grammar is only implemented by
+    the parsers and the backends only by the walkers.
+    """
+
+    def __init__(self, filepath: str, walker, tokenizer=Tokenizer, parser=AstLexicon):
+        self.parser = parser(filepath, tokenizer=tokenizer)
+        self.walker = walker
+        self.program = None
+
+    @property
+    def tape(self):
+        return self.parser.tape
+
+    @property
+    def tokenizer(self):
+        return self.parser.tokenizer
+
+    @property
+    def tokens(self):
+        return self.parser.tokens
+
+    @property
+    def symbols(self):
+        return self.parser.symbols
+
+    @property
+    def compiler(self):
+        return self.walker.compiler
+
+    def _walk(self, metrics):
+        """Parse and generate the code, returning it and the CompileMetrics (None when not collected)."""
+        metrics = CompileMetrics.attach(self.parser, metrics)
+
+        with phase(metrics, 'parse'):
+            self.program = self.parser.parse()
+        with phase(metrics, 'codegen'):
+            code = self.walker.generate(self.program)
+
+        return code, metrics
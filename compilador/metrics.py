@@ -0,0 +1,180 @@
+"""
+What a compile cost, collected on request by the parsers.
+
+    code, metrics = ObjectLexicon('dados/exemplo.lalg.txt').parse(metrics=True)
+    print(metrics.as_dict())
+
+Tokens are counted as the parser reads them, so the compile measured is
+the one that runs without metrics, streaming tapes included. The time
+spent in the tokenizer is reported as the 'tokenize' phase and left out of
+'parse', which builds the syntax tree; walking it is the 'codegen' phase.
+Tokenizing has no memory peak of its own, its allocations are part of the
+'parse' peak. Optional phases ('optimize',
+'fuse') are only reported when they run. Tracing memory with tracemalloc
+slows the compile down several times, pass
+CompileMetrics(trace_memory=False) for comparable wall times.
+"""
+import contextlib
+import time
+import tracemalloc
+
+from .tracing import CountingTracer, trace_productions
+
+
+class Phase:
+    """Wall time in seconds and peak of memory allocated (bytes) of a phase."""
+
+    __slots__ = ('time', 'peak')
+
+    def __init__(self, time_: float = 0.0, peak: int = None):
+        self.time = time_
+        self.peak = peak
+
+    def __repr__(self):
+        return f'Phase<time={self.time:.6f}, peak={self.peak}>'
+
+
+class _CountingTokenizer:
+    """Tokenizer counting the tokens it hands out, and the time spent scanning them."""
+
+    def __init__(self, tokenizer, metrics: 'CompileMetrics', phase_: Phase):
+        self.tokenizer = tokenizer
+        self._next = tokenizer.next_token
+        self._counts = metrics.tokens
+        self._phase = phase_
+
+    def next_token(self):
+        start = time.perf_counter()
+        try:
+            token = self._next()
+        finally:
+            self._phase.time += time.perf_counter() - start
+        counts = self._counts
+        counts[token.tipo] = counts.get(token.tipo, 0) + 1
+        return token
+
+
+class CompileMetrics:
+    """
+    Counts and costs of one compile.
+
+    tokens          tokens scanned by TokenType, whitespace and comments included
+    chars           characters scanned
+    rewinds         times the tape was rewound by a TapeContext
+    productions     productions entered, by name
+    symbols         variables declared
+    temporaries     temporaries made by SymbolsTable.make_temp
+    instructions    instructions emitted by the parser, before optimizations
+    phases          Phase by name, in the order they ran
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.tokens = dict()
+        self.chars = 0
+        self.rewinds = 0
+        self.productions = dict()
+        self.symbols = 0
+        self.temporaries = 0
+        self.instructions = 0
+        self.phases = dict()
+        self._tracer = None
+        self._rewinds = 0
+
+    def __repr__(self):
+        return (f'CompileMetrics<tokens={sum(self.tokens.values())}, chars={self.chars}, '
+                f'instructions={self.instructions}, time={self.time:.6f}>')
+
+    @property
+    def time(self) -> float:
+        return sum(phase.time for phase in self.phases.values())
+
+    @classmethod
+    def attach(cls, parser, metrics) -> 'CompileMetrics':
+        """
+        Start collecting the metrics of `parser`, before it parses.
+
+        `metrics` is what the parser got: a false value disables collecting
+        (returns None), True collects into a new CompileMetrics.
+        """
+        if not metrics:
+            return None
+        if metrics is True:
+            metrics = cls()
+
+        metrics._rewinds = parser.tape.rewinds
+        # first in `phases`, its time is added up while parsing
+        tokenize = metrics.phases['tokenize'] = Phase()
+        parser.tokens.tokenizer = _CountingTokenizer(parser.tokens.tokenizer, metrics, tokenize)
+
+        metrics._tracer = CountingTracer()
+        trace_productions(parser, metrics._tracer)
+        return metrics
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time the block as phase `name`, with its memory peak if tracing memory."""
+        phase = self.phases[name] = Phase()
+        if not self.trace_memory:
+            start = time.perf_counter()
+            try:
+                yield phase
+            finally:
+                phase.time = time.perf_counter() - start
+            return
+
+        # keep tracing if someone else started it, only measuring from here
+        owned = not tracemalloc.is_tracing()
+        if owned:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.time = time.perf_counter() - start
+            phase.peak = tracemalloc.get_traced_memory()[1] - base
+            if owned:
+                tracemalloc.stop()
+
+    def finish(self, parser, instructions: int, temporaries: int = None) -> 'CompileMetrics':
+        """
+        Collect the counts of `parser` after it parsed, `instructions` being
+        the code emitted and `temporaries` those made by the code generator
+        when it keeps them out of `parser.symbols`.
+        """
+        tokenize = self.phases['tokenize']
+        parse = self.phases.get('parse')
+        if parse is not None:
+            parse.time = max(0.0, parse.time - tokenize.time)
+
+        self.chars = parser.tape.pos
+        self.rewinds = parser.tape.rewinds - self._rewinds
+        self.productions = dict(self._tracer.productions)
+        self.symbols = len(parser.symbols.symbols) - parser.symbols.temporaries
+        self.temporaries = parser.symbols.temporaries if temporaries is None else temporaries
+        self.instructions = instructions
+        return self
+
+    def as_dict(self) -> dict:
+        """Plain data, for logging or JSON."""
+        return {
+            'tokens': {tipo.name: count for tipo, count in self.tokens.items()},
+            'chars': self.chars,
+            'rewinds': self.rewinds,
+            'productions': dict(self.productions),
+            'symbols': self.symbols,
+            'temporaries': self.temporaries,
+            'instructions': self.instructions,
+            'phases': {name: {'time': phase.time, 'peak': phase.peak} for name, phase in self.phases.items()},
+        }
+
+
+def phase(metrics: CompileMetrics, name: str):
+    """`metrics.phase(name)`, or a context doing nothing when not collecting metrics."""
+    if metrics is None:
+        return contextlib.nullcontext()
+    return metrics.phase(name)
@@ -0,0 +1,72 @@
+import re
+
+from .errors import CompilerSyntaxError
+from .tape import Tape
+from .token import COMMENT, IDENTIFICADOR, INTEIRO, REAL, SIMBOLO, Token, WHITESPACE
+
+
+master_pattern = re.compile(r'''
+      (?P<real>[0-9]+\.[0-9]+)
+    | (?P<bad_real>[0-9]+\.)
+    | (?P<inteiro>[0-9]+)
+    | (?P<identificador>[A-Za-z][A-Za-z0-9]*)
+    | (?P<whitespace>[ \t\r\n]+)
+    | (?P<comentario>\{.*?\}|/\*.*?\*/)
+    | (?P<open_comment>\{|/\*)
+    | (?P<simbolo>:=|<>|<=|>=|[=$()+\-*/.;,<>:])
+    | (?P<ilegal>.)
+''', re.VERBOSE | re.DOTALL)
+
+# groups whose match may change if more input is appended
+partial_groups = frozenset({'bad_real', 'open_comment'})
+
+kinds = {
+    'real': REAL,
+    'inteiro': INTEIRO,
+    'identificador': IDENTIFICADOR,
+    'whitespace': WHITESPACE,
+    'comentario': COMMENT,
+    'simbolo': SIMBOLO,
+}
+
+
+class RegexTokenizer:
+    """
+    Tokenizer that recognises each token with a single match of `master_pattern`.
+
+    Produces the same tokens and syntax errors as the state machine in
+    Tokenizer and can be used in its place.
+    """
+
+    def __init__(self, tape: Tape):
+        self.tape = tape
+        # number of next_token calls, for measuring re-tokenization
+        self.calls = 0
+
+    def next_token(self) -> Token:
+        self.calls += 1
+        tape = self.tape
+        if tape.is_eof():
+            raise EOFError()
+
+        m = tape.match(master_pattern, partial_groups)
+        kind = m.lastgroup
+        start, end = m.span()
+
+        if kind in kinds:
+            # the match is relative to the text the tape holds
+            base = tape.pos - start
+            tape.pos += end - start
+            return Token.span(kinds[kind], tape.window(), start + base, end + base)
+
+        if kind == 'ilegal':
+            raise CompilerSyntaxError(f"Caractere ilegal: {m.group()!r}", tape.pos)
+        if kind == 'open_comment':
+            # comment is never closed
+            raise EOFError()
+
+        # bad_real
+        size = end - start
+        if tape.is_eof(size):
+            raise EOFError()
+        raise CompilerSyntaxError.simples('dígito', repr(tape.get_char(size)), tape.pos + size)
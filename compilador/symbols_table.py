@@ -36,6 +36,8 @@ class SymbolsTable:
     def __init__(self):
         self.symbols = dict()
         self._tmp_id = 1
+        # symbols added by make_temp
+        self.temporaries = 0
 
     def get(self, name) -> Symbol:
         name = normalize_name(name)
@@ -67,6 +69,7 @@ class SymbolsTable:
 
         tmp = Token.identificador(f't{self._tmp_id}')
         self.add(tmp, type_)
+        self.temporaries += 1
         return tmp
 
     def typeof(self, name):
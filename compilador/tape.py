@@ -1,8 +1,67 @@
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+
+from .token import Source
+
+
+# `text` is the line holding the offset (only its tail, if the start was
+# already dropped by a StreamingTape) and `index` the offset within it
+Location = namedtuple('Location', 'line column text index')
+
+
+class LineIndex:
+    """
+    Start offsets of the lines of a text, for mapping offsets to line and column.
+
+    `base` is the absolute offset of the first character of `text`, and
+    `first_line`/`first_column` the position of that character.
+    """
+
+    def __init__(self, text: str, base: int = 0, first_line: int = 1, first_column: int = 1):
+        self.text = text
+        self.base = base
+        self.first_line = first_line
+        self.first_column = first_column
+
+        starts = [0]
+        find = text.find
+        i = find('\n')
+        while i >= 0:
+            starts.append(i + 1)
+            i = find('\n', i + 1)
+        self.starts = starts
+
+    def location(self, offset: int):
+        """Line and column (both counted from 1) of an absolute offset, and the text around it."""
+        pos = offset - self.base
+        if not 0 <= pos <= len(self.text):
+            return None
+
+        i = bisect_right(self.starts, pos) - 1
+        start = self.starts[i]
+        end = self.text.find('\n', start)
+        if end < 0:
+            end = len(self.text)
+
+        index = pos - start
+        column = index + 1
+        if i == 0:
+            column += self.first_column - 1
+        return Location(self.first_line + i, column, self.text[start:end].rstrip('\r'), index)
+
+
 class Tape:
+    # times a TapeContext moved the position back, see TapeContext.__exit__
+    rewinds = 0
+    _source = None
+
     def __init__(self, filepath: str):
         with open(filepath, 'rt') as f:
             self.code = f.read()
+        self.filepath = filepath
         self.pos = 0
+        self._lines = None
 
     def next(self):
         self.pos += 1
@@ -14,10 +73,9 @@ class Tape:
         return TapeContext(self, freeze)
 
     def get_char(self, pos=0):
-        pos += self.pos
-        if self.is_eof():
+        if self.is_eof(pos):
             raise EOFError()
-        return self.code[pos]
+        return self.code[self.pos + pos]
 
     def next_char(self):
         self.next()
@@ -45,12 +103,202 @@ class Tape:
         pos += self.pos
         return pos >= len(self.code) or pos < 0
 
+    def match(self, pattern, partial_groups=frozenset()):
+        """
+        Match a compiled regex at the current position without moving it.
+
+        :param pattern:         compiled regular expression
+        :param partial_groups:  names of groups that may match differently
+                                once more input is available
+        :return:                the match object, with positions relative to
+                                the tape's internal buffer
+        """
+        return pattern.match(self.code, self.pos)
+
+    def find(self, sub: str, pos=0) -> int:
+        """Return the absolute position of the next `sub` at or after pos, relative to the current one, or -1."""
+        return self.code.find(sub, self.pos + pos)
+
+    def window(self) -> Source:
+        """
+        Return the text held in memory with the absolute position of its first
+        character. Tokens slice their value from it.
+        """
+        if self._source is None:
+            self._source = Source(self.code)
+        return self._source
+
+    def location(self, offset: int):
+        """Location of an absolute offset. Lines are only indexed on the first call."""
+        if self._lines is None:
+            self._lines = LineIndex(self.code)
+        return self._lines.location(offset)
+
+    def pin(self, pos):
+        """Called by TapeContext while it may rewind to `pos`."""
+        pass
+
+    def unpin(self, pos):
+        pass
+
+
+class TextTape(Tape):
+    """
+    Tape over text already in memory.
+
+    `base`, `first_line` and `first_column` place the text inside a larger
+    source: offsets given to `location` are absolute, like those of
+    LineIndex. Tokenizer positions always start at 0.
+    """
+
+    def __init__(self, code: str, filepath: str = None, base: int = 0, first_line: int = 1, first_column: int = 1):
+        self.code = code
+        self.filepath = filepath
+        self.pos = 0
+        self.base = base
+        self.first_line = first_line
+        self.first_column = first_column
+        self._lines = None
+
+    def location(self, offset: int):
+        if self._lines is None:
+            self._lines = LineIndex(self.code, self.base, self.first_line, self.first_column)
+        return self._lines.location(offset)
+
+
+class StreamingTape(Tape):
+    """
+    Tape that reads its source in chunks instead of loading it whole.
+
+    Accepts a path, a text file object, or '-'/None for stdin. Only a sliding
+    buffer is kept: characters before the current position and before every
+    position a TapeContext may rewind to are dropped when more input is read.
+    `peak_buffer_size` reports the largest buffer held.
+    """
+
+    def __init__(self, source=None, chunk_size=64 * 1024):
+        if source is None or source == '-':
+            self._file = sys.stdin
+            self._owns_file = False
+        elif isinstance(source, str):
+            self._file = open(source, 'rt')
+            self._owns_file = True
+        else:
+            self._file = source
+            self._owns_file = False
+
+        self.filepath = getattr(self._file, 'name', None)
+        self.chunk_size = chunk_size
+        self.pos = 0
+        self.peak_buffer_size = 0
+        self._buffer = ''
+        self._base = 0
+        # position of the first character of the buffer, so locations keep
+        # counting lines and columns after the start is dropped
+        self._base_line = 1
+        self._base_column = 1
+        self._eof = False
+        self._pins = []
+
+    @property
+    def buffer_size(self):
+        return len(self._buffer)
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+    def _fill(self):
+        keep = min(self._pins, default=self.pos)
+        keep = min(keep, self.pos)
+        drop = keep - self._base
+        # only compact when at least half of the buffer is stale
+        if drop > 0 and drop * 2 >= len(self._buffer):
+            newline = self._buffer.rfind('\n', 0, drop)
+            if newline < 0:
+                self._base_column += drop
+            else:
+                self._base_line += self._buffer.count('\n', 0, drop)
+                self._base_column = drop - newline
+            self._buffer = self._buffer[drop:]
+            self._base = keep
+
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            self.close()
+            return
+
+        self._buffer += chunk
+        self.peak_buffer_size = max(self.peak_buffer_size, len(self._buffer))
+
+    def get_char(self, pos=0):
+        if self.is_eof(pos):
+            raise EOFError()
+        pos += self.pos - self._base
+        if pos < 0:
+            raise IndexError(f'Posição {self.pos} já foi descartada do buffer')
+        return self._buffer[pos]
+
+    def is_eof(self, pos=0):
+        pos += self.pos
+        if pos < 0:
+            return True
+        while pos >= self._base + len(self._buffer):
+            if self._eof:
+                return True
+            self._fill()
+        return False
+
+    def match(self, pattern, partial_groups=frozenset()):
+        while True:
+            m = pattern.match(self._buffer, self.pos - self._base)
+            complete = (
+                m is not None
+                and m.end() < len(self._buffer)
+                and m.lastgroup not in partial_groups)
+            if complete or self._eof:
+                return m
+            self._fill()
+
+    def find(self, sub: str, pos=0) -> int:
+        start = self.pos + pos
+        while True:
+            i = self._buffer.find(sub, start - self._base)
+            if i >= 0:
+                return i + self._base
+            if self._eof:
+                return -1
+            # the end of the buffer may hold the beginning of sub
+            start = max(start, self._base + len(self._buffer) - len(sub) + 1)
+            self._fill()
+
+    def window(self) -> Source:
+        source = self._source
+        # the buffer is a new string whenever it grows or drops its start,
+        # except a one character buffer, which can be the same cached string
+        # for a different base
+        if source is None or source.text is not self._buffer or source.base != self._base:
+            source = self._source = Source(self._buffer, self._base)
+        return source
+
+    def location(self, offset: int):
+        """Location of an absolute offset, or None if it was already dropped from the buffer."""
+        return LineIndex(self._buffer, self._base, self._base_line, self._base_column).location(offset)
+
+    def pin(self, pos):
+        self._pins.append(pos)
+
+    def unpin(self, pos):
+        self._pins.remove(pos)
+
 
 class TapeContext:
     def __init__(self, tape: Tape, freeze=True):
         self.tape = tape
         self._saved_pos = None
         self._freeze = freeze
+        self._pinned = False
 
     def __enter__(self):
         self.save_pos()
@@ -58,10 +306,21 @@ class TapeContext:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self._freeze:
+            if self.tape.pos != self._saved_pos:
+                self.tape.rewinds += 1
             self.tape.pos = self._saved_pos
+        self._release()
+
+    def _release(self):
+        if self._pinned:
+            self.tape.unpin(self._saved_pos)
+            self._pinned = False
 
     def save_pos(self):
+        self._release()
         self._saved_pos = self.tape.pos
+        self.tape.pin(self._saved_pos)
+        self._pinned = True
 
     def freeze(self):
         self.save_pos()
@@ -69,3 +328,5 @@ class TapeContext:
 
     def unfreeze(self):
         self._freeze = False
+        # no rewind will happen, so the tape may discard the saved position
+        self._release()
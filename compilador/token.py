@@ -1,7 +1,8 @@
-from enum import auto, Enum
+import sys
+from enum import auto, Enum, IntEnum
 
 
-class TokenType(Enum):
+class TokenType(IntEnum):
     IDENTIFICADOR = auto()
     INTEIRO = auto()
     REAL = auto()
@@ -9,11 +10,72 @@ class TokenType(Enum):
     WHITESPACE = auto()
     COMMENT = auto()
 
+    __str__ = Enum.__str__
+
+
+# member lookups on an Enum class are slow, hot paths use these names instead
+IDENTIFICADOR, INTEIRO, REAL, SIMBOLO, WHITESPACE, COMMENT = TokenType
+
+numbers = frozenset({INTEIRO, REAL})
+
+
+class Source:
+    """
+    Text a tape holds and the absolute offset of its first character.
+
+    Tapes hand out the same Source until their text changes, so the tokens
+    sliced from it share one reference instead of keeping the offset each.
+    """
+
+    __slots__ = ('text', 'base')
+
+    def __init__(self, text: str, base: int = 0):
+        self.text = text
+        self.base = base
+
 
 class Token:
-    def __init__(self, tipo: TokenType, valor: str):
+    """
+    Token with its kind and value.
+
+    Tokens made by the tokenizers keep the Source they were scanned from and
+    their offset in it and only slice `valor` when it is first read, so
+    tokens the parser discards (whitespace and comments) never copy their
+    text.
+    """
+
+    # the length is kept instead of the end offset: it is almost always a
+    # small, shared int, where a second large offset would be a new object.
+    # `_valor` holds the Source until the value is sliced
+    __slots__ = ('tipo', 'start', 'size', '_valor')
+
+    def __init__(self, tipo: TokenType, valor: str, start: int = None, size: int = None):
         self.tipo = tipo
-        self.valor = valor
+        self.start = start
+        self.size = size
+        self._valor = valor
+
+    @classmethod
+    def span(cls, tipo: TokenType, source: Source, start: int, end: int):
+        """Token for the text between the absolute offsets `start` and `end` of `source`, sliced lazily."""
+        token = cls(tipo, None, start, end - start)
+        token._valor = source
+        return token
+
+    @property
+    def valor(self) -> str:
+        valor = self._valor
+        if valor.__class__ is Source:
+            start = self.start - valor.base
+            valor = valor.text[start:start + self.size]
+            if self.tipo == IDENTIFICADOR:
+                valor = sys.intern(valor)
+            self._valor = valor
+        return valor
+
+    @property
+    def end(self):
+        return None if self.start is None else self.start + self.size
 
     def __str__(self):
         return repr(self.valor)
@@ -22,41 +84,43 @@ class Token:
         return f"Token<{self.tipo.name}, {self.valor!r}>"
 
     def __eq__(self, other):
-        if isinstance(other, Enum):
-            other = other.value
+        if other.__class__ is not Token:
+            if isinstance(other, Enum):
+                other = other.value
 
-        if isinstance(other, Token):
-            return self.tipo == other.tipo and self.valor == other.valor
-        elif (isinstance(other, tuple) or isinstance(other, list)) and len(other) == 2:
-            tipo, valor = other
-            return self.tipo == tipo and self.valor == valor
+            if (isinstance(other, tuple) or isinstance(other, list)) and len(other) == 2:
+                tipo, valor = other
+                return self.tipo == tipo and self.valor == valor
+            elif not isinstance(other, Token):
+                return False
 
-        return False
+        return self.tipo == other.tipo and self.valor == other.valor
 
     @property
     def is_number(self):
-        return self.tipo in {TokenType.INTEIRO, TokenType.REAL}
+        return self.tipo in numbers
 
     @classmethod
     def identificador(cls, valor):
-        return cls(TokenType.IDENTIFICADOR, valor)
+        # names repeat all over a program, keep a single copy of each
+        return cls(IDENTIFICADOR, sys.intern(valor))
 
     @classmethod
     def inteiro(cls, valor):
-        return cls(TokenType.INTEIRO, valor)
+        return cls(INTEIRO, valor)
 
     @classmethod
     def real(cls, valor):
-        return cls(TokenType.REAL, valor)
+        return cls(REAL, valor)
 
     @classmethod
     def simbolo(cls, valor):
-        return cls(TokenType.SIMBOLO, valor)
+        return cls(SIMBOLO, valor)
 
     @classmethod
     def whitespace(cls, valor):
-        return cls(TokenType.WHITESPACE, valor)
+        return cls(WHITESPACE, valor)
 
     @classmethod
     def comentario(cls, valor):
-        return cls(TokenType.COMMENT, valor)
+        return cls(COMMENT, valor)
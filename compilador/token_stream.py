@@ -0,0 +1,59 @@
+from collections import deque
+
+from .token import Token, TokenType
+
+
+skipped = frozenset({TokenType.WHITESPACE, TokenType.COMMENT})
+
+
+class TokenStream:
+    """
+    Significant tokens of a tokenizer, with a bounded lookahead buffer.
+
+    Whitespace and comments are dropped. Peeked tokens stay in the buffer
+    until consumed, so every character is scanned by the tokenizer once and
+    parsers never need to rewind the tape. Reading past the end of the
+    input raises EOFError, as the tokenizers do.
+    """
+
+    def __init__(self, tokenizer, lookahead: int = 1):
+        self.tokenizer = tokenizer
+        self.lookahead = lookahead
+        self._buffer = deque()
+        # tokens returned by the tokenizer, skipped ones included
+        self.scanned = 0
+        # last token consumed, for locating errors raised by the parser
+        self.last = None
+
+    def _scan(self) -> Token:
+        next_token = self.tokenizer.next_token
+        while True:
+            token = next_token()
+            self.scanned += 1
+            if token.tipo not in skipped:
+                return token
+
+    def peek(self, k: int = 0) -> Token:
+        """Return the k-th token ahead without consuming it."""
+        if k >= self.lookahead:
+            raise ValueError(f'Lookahead máximo é {self.lookahead}')
+
+        buffer = self._buffer
+        while len(buffer) <= k:
+            buffer.append(self._scan())
+        return buffer[k]
+
+    def next(self) -> Token:
+        if self._buffer:
+            token = self._buffer.popleft()
+        else:
+            token = self._scan()
+        self.last = token
+        return token
+
+    def accept(self, expected) -> bool:
+        """Consume the next token if it is equal to `expected`."""
+        if self.peek() == expected:
+            self.last = self._buffer.popleft()
+            return True
+        return False
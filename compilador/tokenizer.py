@@ -1,33 +1,46 @@
-import logging
+import re
 
 from .errors import CompilerSyntaxError
 from .tape import Tape
-from .token import Token
+from .token import COMMENT, IDENTIFICADOR, INTEIRO, REAL, SIMBOLO, Token, WHITESPACE
 
 
-_logger = logging.getLogger(__name__)
-
 comment_delimiters = {
     '{': '}',
     '/*': '*/'
 }
 
+whitespace = re.compile(r'[ \t\r\n]+')
+
 
 class Tokenizer:
     def __init__(self, tape: Tape):
         self.tape = tape
+        # number of next_token calls, for measuring re-tokenization
+        self.calls = 0
         self.state = 0
-        self._token_val = None
+        self._start = None
 
     def next_token(self) -> Token:
+        self.calls += 1
         if self.state != 0:
             raise CompilerSyntaxError(f"Estado inesperado do automato: {self.state}")
-        return self._state0()
 
-    def _state0(self):
-        _logger.debug('state 0')
+        # the states only move the tape, the token is sliced from where it started
+        tape = self.tape
+        self._start = tape.pos
+        tape.pin(self._start)
+        try:
+            return self._state0()
+        finally:
+            tape.unpin(self._start)
+
+    def _lexeme(self) -> str:
+        source = self.tape.window()
+        return source.text[self._start - source.base:self.tape.pos + 1 - source.base]
 
-        self._token_val = c = self.tape.get_char()
+    def _state0(self):
+        c = self.tape.get_char()
         if self.tape.is_num():
             return self._state1()
         elif self.tape.is_letra():
@@ -45,109 +58,77 @@ class Tokenizer:
         elif c == '{':
             return self._state10()
 
-        raise CompilerSyntaxError(f"Caractere ilegal: {c!r}")
+        raise CompilerSyntaxError(f"Caractere ilegal: {c!r}", self.tape.pos)
 
     def _state1(self):
-        _logger.debug('state 1')
-
         while self.tape.is_num(1):
-            self._token_val += self.tape.next_char()
+            self.tape.next()
 
         if not self.tape.is_eof(1) and self.tape.get_char(1) == '.':
-            self._token_val += self.tape.next_char()
+            self.tape.next()
             return self._state2()
 
-        token = Token.inteiro(self._token_val)
-        return self._end_state(token)
+        return self._end_state(INTEIRO)
 
     def _state2(self):
-        _logger.debug('state 2')
-
         c = self.tape.next_char()
         if not self.tape.is_num():
-            raise CompilerSyntaxError.simples('dígito', repr(c))
+            raise CompilerSyntaxError.simples('dígito', repr(c), self.tape.pos)
 
-        self._token_val += c
         return self._state3()
 
     def _state3(self):
-        _logger.debug('state 3')
-
         while self.tape.is_num(1):
-            self._token_val += self.tape.next_char()
+            self.tape.next()
 
-        token = Token.real(self._token_val)
-        return self._end_state(token)
+        return self._end_state(REAL)
 
     def _state4(self):
-        _logger.debug('state 4')
-
         while self.tape.is_num(1) or self.tape.is_letra(1):
-            self._token_val += self.tape.next_char()
+            self.tape.next()
 
-        token = Token.identificador(self._token_val)
-        return self._end_state(token)
+        return self._end_state(IDENTIFICADOR)
 
     def _state5(self):
-        _logger.debug('state 5')
-
-        token = Token.simbolo(self._token_val)
-        return self._end_state(token)
+        return self._end_state(SIMBOLO)
 
     def _state6(self):
-        _logger.debug('state 6')
-
-        if self.tape.get_char(1) == '=':
-            self._token_val += self.tape.next_char()
+        if not self.tape.is_eof(1) and self.tape.get_char(1) == '=':
+            self.tape.next()
 
         return self._state5()
 
     def _state7(self):
-        _logger.debug('state 7')
-
-        if self.tape.get_char(1) in '=>':
-            self._token_val += self.tape.next_char()
+        if not self.tape.is_eof(1) and self.tape.get_char(1) in '=>':
+            self.tape.next()
 
         return self._state5()
 
     def _state8(self):
-        _logger.debug('state 8')
-
-        while not self.tape.is_eof(1):
-            c = self.tape.get_char(1)
-            if c not in ' \t\n\r':
-                break
-            self._token_val += c
-            self.tape.next()
-
-        token = Token.whitespace(self._token_val)
-        return self._end_state(token)
+        m = self.tape.match(whitespace)
+        self.tape.pos += m.end() - m.start() - 1
+        return self._end_state(WHITESPACE)
 
     def _state9(self):
-        _logger.debug('state 9')
-
-        if self.tape.get_char(1) == '*':
-            self._token_val += self.tape.next_char()
+        if not self.tape.is_eof(1) and self.tape.get_char(1) == '*':
+            self.tape.next()
             return self._state10()
         else:
             return self._state5()
 
     def _state10(self):
-        _logger.debug('state 10')
+        delimiter = comment_delimiters[self._lexeme()]
 
-        delimiter = comment_delimiters[self._token_val]
+        end = self.tape.find(delimiter, 1)
+        if end < 0:
+            # comment is never closed
+            raise EOFError()
 
-        while not all(self.tape.get_char(i + 1) == d for i, d in enumerate(delimiter)):
-            self._token_val += self.tape.next_char()
+        self.tape.pos = end + len(delimiter) - 1
+        return self._end_state(COMMENT)
 
-        self._token_val += delimiter
-        self.tape.pos += len(delimiter)
-        token = Token.comentario(self._token_val)
-        return self._end_state(token)
-
-    def _end_state(self, token: Token):
-        _logger.info(token)
-        self.state = 0
-        self._token_val = None
+    def _end_state(self, tipo):
         self.tape.next()
+        token = Token.span(tipo, self.tape.window(), self._start, self.tape.pos)
+        self.state = 0
         return token
@@ -0,0 +1,251 @@
+"""
+Tracing hooks for the tokenizers, parsers and code generators.
+
+The compiler classes make no tracing calls. `traced` builds a subclass that
+reports to a Tracer, so only compiles that ask for tracing pay for it:
+
+    tracer = LoggingTracer()
+    parser = traced_parser(ObjectLexicon, 'dados/exemplo.lalg.txt', tracer)
+    parser.parse()
+
+LoggingTracer writes the debug log the compiler used to write.
+"""
+import functools
+import logging
+import re
+
+from .tokenizer import Tokenizer
+
+
+_state = re.compile(r'_state(\d+)$')
+_production = re.compile(r'\s*Implementa (<\w+>)')
+
+
+class Tracer:
+    """
+    Receives the events of a compile, ignoring them. Subclasses override the
+    events they want. `source` is the tokenizer, parser or code generator
+    sending the event.
+    """
+
+    def state(self, source, state: int):
+        """The tokenizer entered a state of its automaton."""
+
+    def token(self, source, token):
+        """The tokenizer read a token, whitespace and comments included."""
+
+    def enter(self, source, production: str):
+        """The parser started a production."""
+
+    def exit(self, source, production: str):
+        """The parser finished a production, also when it raised an error."""
+
+    def emit(self, source, instruction):
+        """The code generator wrote an instruction, also when filling in a jump."""
+
+
+class LoggingTracer(Tracer):
+    """Logs the events to the logger of the module of their source, as the compiler used to."""
+
+    def __init__(self):
+        self._loggers = dict()
+
+    def _logger(self, source) -> logging.Logger:
+        module = type(source).__module__
+        logger = self._loggers.get(module)
+        if logger is None:
+            logger = self._loggers[module] = logging.getLogger(module)
+        return logger
+
+    def state(self, source, state):
+        self._logger(source).debug(f'state {state}')
+
+    def token(self, source, token):
+        self._logger(source).info(token)
+
+    def enter(self, source, production):
+        self._logger(source).debug(production)
+
+    def emit(self, source, instruction):
+        self._logger(source).debug(instruction)
+
+
+class CountingTracer(Tracer):
+    """Counts the events, by kind and by state, production or token type."""
+
+    def __init__(self):
+        self.states = dict()
+        self.tokens = dict()
+        self.productions = dict()
+        self.instructions = 0
+
+    def state(self, source, state):
+        self.states[state] = self.states.get(state, 0) + 1
+
+    def token(self, source, token):
+        self.tokens[token.tipo] = self.tokens.get(token.tipo, 0) + 1
+
+    def enter(self, source, production):
+        self.productions[production] = self.productions.get(production, 0) + 1
+
+    def emit(self, source, instruction):
+        self.instructions += 1
+
+
+class TracedCode(list):
+    """Code list that reports the instructions written to it. Placeholders (None) are not reported."""
+
+    def __init__(self, code, emit):
+        super().__init__(code)
+        self._emit = emit
+
+    def append(self, instruction):
+        super().append(instruction)
+        if instruction is not None:
+            self._emit(instruction)
+
+    def __setitem__(self, i, instruction):
+        super().__setitem__(i, instruction)
+        if instruction is not None:
+            self._emit(instruction)
+
+
+def trace_code(compiler, tracer: Tracer):
+    """Report the instructions `compiler` writes from now on to `tracer`."""
+    compiler.code = TracedCode(compiler.code, functools.partial(tracer.emit, compiler))
+    return compiler
+
+
+def _trace_state(method, state):
+    @functools.wraps(method)
+    def traced_state(self, *args):
+        self.tracer.state(self, state)
+        return method(self, *args)
+    return traced_state
+
+
+def _trace_token(method):
+    @functools.wraps(method)
+    def next_token(self):
+        token = method(self)
+        self.tracer.token(self, token)
+        return token
+    return next_token
+
+
+def _trace_production(method, production):
+    @functools.wraps(method)
+    def traced_production(self, *args, **kwargs):
+        tracer = self.tracer
+        tracer.enter(self, production)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            tracer.exit(self, production)
+    return traced_production
+
+
+def _trace_rows(parser, tracer):
+    """Wrap every production of a table driven parser (TableLexicon) in enter and exit actions."""
+    rows = []
+    for name, row in zip(parser._names, parser._rows):
+        enter = functools.partial(tracer.enter, parser, name)
+        exit_ = functools.partial(tracer.exit, parser, name)
+        # right hand sides are reversed: the last symbol is the first run
+        rows.append({t: (exit_,) + rhs + (enter,) for t, rhs in row.items()})
+    return rows
+
+
+def trace_productions(parser, tracer: Tracer):
+    """
+    Report the productions `parser` enters from now on to `tracer`.
+
+    Unlike `traced`, wraps the methods of an existing parser, so only its
+    productions are reported, not its tokenizer or code generator.
+    """
+    if hasattr(parser, '_rows'):
+        parser._rows = _trace_rows(parser, tracer)
+        return parser
+
+    cls = type(parser)
+    for name in dir(cls):
+        method = getattr(cls, name)
+        if not (callable(method) and name.startswith('_')):
+            continue
+
+        m = _production.match(method.__doc__ or '')
+        if m:
+            # wraps what the instance has, so tracing it twice reports to both tracers
+            setattr(parser, name, functools.partial(_report_production, tracer, parser, getattr(parser, name),
+                                                    m.group(1)))
+    return parser
+
+
+def _report_production(tracer, parser, method, production, *args, **kwargs):
+    tracer.enter(parser, production)
+    try:
+        return method(*args, **kwargs)
+    finally:
+        tracer.exit(parser, production)
+
+
+def traced(cls, tracer: Tracer):
+    """
+    Subclass of a tokenizer, parser or code generator class reporting to `tracer`.
+
+    Tokenizers report their `_stateN` methods and the tokens of
+    `next_token`. Parsers report the methods documented as
+    `Implementa <production>`, or the productions of their LL(1) table;
+    compilers walking a syntax tree (ObjectLexicon, Lexicon) those of their
+    `parser`. Code generators report what is written to their `code`.
+    """
+    namespace = {'__module__': cls.__module__, '__doc__': cls.__doc__, 'tracer': tracer}
+
+    for name in dir(cls):
+        method = getattr(cls, name)
+        if not callable(method):
+            continue
+
+        m = _state.match(name)
+        if m:
+            namespace[name] = _trace_state(method, int(m.group(1)))
+            continue
+
+        m = _production.match(method.__doc__ or '')
+        if m and name.startswith('_'):
+            namespace[name] = _trace_production(method, m.group(1))
+
+    if hasattr(cls, 'next_token'):
+        namespace['next_token'] = _trace_token(cls.next_token)
+
+    init = cls.__init__
+    is_compiler = hasattr(cls, 'para')
+
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        if is_compiler:
+            trace_code(self, tracer)
+        elif hasattr(self, '_rows'):
+            self._rows = _trace_rows(self, tracer)
+        elif hasattr(self, 'parser'):
+            trace_productions(self.parser, tracer)
+
+    namespace['__init__'] = __init__
+    return type(cls.__name__, (cls,), namespace)
+
+
+def traced_parser(parser_cls, filepath, tracer: Tracer, compiler=None, tokenizer=Tokenizer, **kwargs):
+    """
+    A parser whose tokenizer, productions and code generator report to `tracer`.
+
+    `compiler` is traced from its current state on. Parsers that create their
+    own code generator (ObjectLexicon) have it traced after creation.
+    """
+    if compiler is not None:
+        kwargs['compiler'] = compiler
+
+    parser = traced(parser_cls, tracer)(filepath, tokenizer=traced(tokenizer, tracer), **kwargs)
+    compiler = getattr(parser, 'compiler', None)
+    if compiler is not None and not isinstance(compiler.code, TracedCode):
+        trace_code(compiler, tracer)
+    return parser
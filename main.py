@@ -1,5 +1,6 @@
 import sys
 
+from compilador.interpreter.object_interpreter import Interpreter
 from compilador.lexicon.object_lexicon import ObjectLexicon
 
 